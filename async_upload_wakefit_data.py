@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+Wakefit Supply Chain Data Upload Script - asyncio engine
+Streams the data files into PostgreSQL with psycopg 3 async COPY, overlapping
+file reads, encoding and network transfer across several tables at once
+"""
+
+import asyncio
+import os
+import signal
+import sys
+import time
+from datetime import datetime
+
+import psycopg
+
+from upload_wakefit_data import (CSV_FOLDER, POSTGRES_CONFIG, WakefitDataUploader, check_settings,
+                                 frame_csv_chunks, parse_arguments)
+
+# Each table streams through reader -> encoder -> writer stages joined by queues of at most
+# ASYNC_QUEUE_BLOCKS blocks; a CSV file is read ASYNC_BLOCK_KB at a time and passed through as is,
+# a Parquet file batch by batch and encoded to CSV off the event loop
+ASYNC_BLOCK_KB = int(os.environ.get('ASYNC_BLOCK_KB', 1024))
+ASYNC_QUEUE_BLOCKS = int(os.environ.get('ASYNC_QUEUE_BLOCKS', 8))
+
+
+class AsyncWakefitDataUploader(WakefitDataUploader):
+    """Full reloads on asyncio, with every table's COPY streamed over psycopg 3 async connections.
+
+    Up to ``workers`` tables are in flight at once, each starting when the
+    tables it references are loaded. Within a table, file reads and Parquet
+    encoding run in worker threads while the event loop keeps the COPY
+    stream busy, so the load is bound by CPU or bandwidth rather than round
+    trips; the bounded queues between stages hold a fast reader back when
+    the network is slow. Cancelling the upload (Ctrl+C, SIGTERM) aborts
+    every COPY in flight and rolls its transaction back. Truncation, the
+    upload manifest, metrics and reporting are shared with the synchronous
+    uploader over its psycopg2 connection.
+    """
+
+    def __init__(self, csv_folder, db_config, block_kb=ASYNC_BLOCK_KB, queue_blocks=ASYNC_QUEUE_BLOCKS, **kwargs):
+        super().__init__(csv_folder, db_config, **kwargs)
+        if self.bulk_load or self.shadow_load or self.delta_load or self.resume:
+            raise ValueError("The async engine only runs full reloads; use upload_wakefit_data.py for "
+                             "bulk, shadow, delta or resumed uploads")
+        if self.load_method != 'copy':
+            raise ValueError("The async engine only loads with COPY")
+        self.block_bytes = block_kb * 1024
+        self.queue_blocks = queue_blocks
+        self.conninfo = psycopg.conninfo.make_conninfo(
+            **{('dbname' if key == 'database' else key): value for key, value in db_config.items()}
+        )
+
+    async def read_blocks(self, data_file, blocks):
+        """Reader stage: raw CSV blocks, or DataFrames of Parquet batches, then None"""
+        if data_file.suffix == '.csv':
+            f = await asyncio.to_thread(open, data_file, 'rb')
+            try:
+                while block := await asyncio.to_thread(f.read, self.block_bytes):
+                    await blocks.put(block)
+            finally:
+                f.close()
+        else:
+            frames = self.read_data_frames(data_file)
+            while (frame := await asyncio.to_thread(next, frames, None)) is not None:
+                await blocks.put(frame)
+        await blocks.put(None)
+
+    async def encode_blocks(self, blocks, encoded):
+        """Encoder stage: CSV blocks pass through, DataFrames become CSV text in a worker thread"""
+        while (block := await blocks.get()) is not None:
+            if not isinstance(block, bytes):
+                block = await asyncio.to_thread(lambda frame: ''.join(frame_csv_chunks([frame])), block)
+            await encoded.put(block)
+        await encoded.put(None)
+
+    async def write_blocks(self, cursor, table_name, columns, header, encoded):
+        """Writer stage: feed the blocks to COPY FROM STDIN; returns the rows copied"""
+        options = "FORMAT csv, HEADER true" if header else "FORMAT csv"
+        async with cursor.copy(f"COPY {table_name} ({','.join(columns)}) FROM STDIN WITH ({options})") as copy:
+            while (block := await encoded.get()) is not None:
+                await copy.write(block)
+        return cursor.rowcount
+
+    async def stream_table(self, table_name, data_file):
+        """COPY one file into its (already truncated) table in a transaction of its own; returns (rows, verified)"""
+        columns = self.file_columns(data_file)
+        blocks = asyncio.Queue(self.queue_blocks)
+        encoded = asyncio.Queue(self.queue_blocks)
+        async with await psycopg.AsyncConnection.connect(self.conninfo) as conn:
+            async with conn.cursor() as cursor:
+                async with asyncio.TaskGroup() as stages:
+                    stages.create_task(self.read_blocks(data_file, blocks))
+                    stages.create_task(self.encode_blocks(blocks, encoded))
+                    writer = stages.create_task(
+                        self.write_blocks(cursor, table_name, columns, data_file.suffix == '.csv', encoded)
+                    )
+                rows = writer.result()
+                await conn.commit()
+
+                verified = None
+                if self.verify:
+                    await cursor.execute(f"SELECT COUNT(*) FROM {table_name}")
+                    verified = (await cursor.fetchone())[0] == rows
+        return rows, verified
+
+    async def upload_table_async(self, table_name):
+        """Load one table; returns (success, log lines)"""
+        lines = []
+        data_file = self.data_file(table_name)
+        if not data_file.exists():
+            return False, [f"  Data file not found: {data_file}"]
+
+        started = time.perf_counter()
+        try:
+            rows, verified = await self.stream_table(table_name, data_file)
+        except Exception as e:
+            # A TaskGroup reports the failing stage inside an ExceptionGroup
+            error = e.exceptions[0] if isinstance(e, ExceptionGroup) else e
+            self.metrics.record_failure(table_name, 'async-copy', error)
+            return False, [f"  Error uploading {table_name}: {error}".rstrip()]
+        finished = time.perf_counter()
+
+        self.metrics.record(table_name, 'async-copy', rows, data_file.stat().st_size, started, finished, rows, verified)
+        lines.append(f"  Copied {rows:,} rows with async COPY FROM STDIN "
+                     f"({data_file.stat().st_size / (1024 * 1024):,.1f} MB in {finished - started:.2f}s)")
+        if verified is False:
+            lines.append(f"  Verification failed: {table_name} does not hold the {rows:,} rows copied")
+        return verified is not False, lines
+
+    async def load_tables(self, tables):
+        """Load tables concurrently in foreign-key order; returns (loaded, failed)"""
+        slots = asyncio.Semaphore(self.workers)
+        finished = {table: asyncio.Event() for table in tables}
+        loaded, failed = [], []
+
+        async def load(table):
+            parents = self.dependencies[table] & set(tables)
+            for parent in parents:
+                await finished[parent].wait()
+            if parents & set(failed):
+                failed.append(table)
+                print(f"Skipped {table}: a referenced table failed to load\n")
+            else:
+                async with slots:
+                    started = time.perf_counter()
+                    success, lines = await self.upload_table_async(table)
+                (loaded if success else failed).append(table)
+                print(f"[{len(loaded) + len(failed)}/{len(tables)}] {table} "
+                      f"({'done' if success else 'FAILED'} in {time.perf_counter() - started:.2f}s)")
+                for line in lines:
+                    print(line)
+                print()
+            finished[table].set()
+
+        async with asyncio.TaskGroup() as group:
+            for table in tables:
+                group.create_task(load(table))
+        return loaded, failed
+
+    async def upload_all_tables_async(self):
+        """Upload the tables whose files changed: truncate them together, then stream them in"""
+        # Only the control tables: this engine keeps no journal, so a sync run's resumable state is left alone
+        self.create_control_tables()
+        tables = self.tables_to_load()
+        if not tables:
+            print("All tables unchanged since their last load; nothing to upload")
+            return 0, []
+
+        print(f"Starting async upload of {len(tables)} tables, {self.workers} in flight...")
+        print("=" * 60)
+        self.truncate_tables(tables)
+        print(f"Cleared existing data from {len(tables)} tables")
+
+        started = time.perf_counter()
+        loaded, failed_tables = await self.load_tables(tables)
+        elapsed = time.perf_counter() - started
+
+        # Manifest entries of the loaded files, so the next run can skip them
+        cursor = self.conn.cursor()
+        for table in loaded:
+            self.record_manifest(cursor, table)
+        self.conn.commit()
+        cursor.close()
+
+        # Summary
+        print("=" * 60)
+        print("Upload Summary:")
+        print(f"  Successful: {len(loaded)} tables")
+        print(f"  Failed: {len(failed_tables)} tables")
+        print(f"  Total rows uploaded: {self.metrics.loaded_rows(loaded):,}")
+        print(f"  Wall time: {elapsed:.2f}s")
+        if failed_tables:
+            print(f"  Failed tables: {', '.join(failed_tables)}")
+        self.write_metrics_report()
+        return len(loaded), failed_tables
+
+
+async def run_upload(uploader):
+    """Run the upload as a task that SIGTERM cancels like Ctrl+C does"""
+    task = asyncio.current_task()
+    try:
+        asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, task.cancel)
+    except (NotImplementedError, RuntimeError):
+        pass  # no signal handlers on this platform's event loop; Ctrl+C still cancels
+    return await uploader.upload_all_tables_async()
+
+
+def main():
+    args = parse_arguments("Upload the Wakefit supply chain dataset to PostgreSQL with asyncio")
+    if not check_settings("Wakefit Supply Chain Data Upload Script (async engine)", args):
+        return 1
+
+    try:
+        uploader = AsyncWakefitDataUploader(CSV_FOLDER, POSTGRES_CONFIG, resume=args.resume, verify=args.verify)
+    except ValueError as e:
+        print(f"Error: {e}")
+        return 1
+
+    if not uploader.connect_db():
+        return 1
+
+    try:
+        try:
+            success_count, failed_tables = asyncio.run(run_upload(uploader))
+        except (KeyboardInterrupt, asyncio.CancelledError):
+            print("\nUpload cancelled; the tables to load were truncated before any COPY started, "
+                  "so those in flight or not yet loaded are left empty")
+            return 130
+
+        if success_count > 0:
+            uploader.show_table_counts()
+
+        print(f"\nUpload completed at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        return 0 if len(failed_tables) == 0 else 1
+    finally:
+        uploader.close_db()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
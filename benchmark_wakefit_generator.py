@@ -0,0 +1,928 @@
+#!/usr/bin/env python3
+"""
+Wakefit Data Generator Benchmarks
+Measures throughput of the vectorized generation engines against the
+per-row reference loops they replaced
+"""
+
+import argparse
+import contextlib
+import hashlib
+import io
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from datetime import time as time_of_day
+from functools import partial
+
+import numpy as np
+import pandas as pd
+
+from optimized_wakefit_generator import TABLE_SCHEMAS, ColumnarTable, FakerValuePools, WakefitFinalDataGenerator, fake
+
+
+def build_generator(output_dir, days, daily_orders):
+    """Create a generator with master data in place, ready for transactional phases"""
+    start = datetime(2024, 1, 1)
+    end = start + timedelta(days=days - 1)
+    with contextlib.redirect_stdout(io.StringIO()):
+        generator = WakefitFinalDataGenerator(
+            output_dir=output_dir,
+            start_date=start.strftime('%Y-%m-%d'),
+            end_date=end.strftime('%Y-%m-%d'),
+            daily_orders=daily_orders
+        )
+        generator.generate_products()
+        generator.validate_products()
+        generator.generate_customers()
+        generator.validate_customers()
+        generator.generate_facilities()
+        generator.validate_facilities()
+    return generator
+
+
+def orders_with_line_items(generator):
+    """Yield (order, line items) pairs, walking the line-item table once in index order"""
+    line_items = generator.order_line_items_data.records(positions=generator.order_line_index.positions)
+    for order, count in zip(generator.orders_data.records(), generator.order_line_index.counts()):
+        yield order, [next(line_items) for _ in range(count)]
+
+
+
+def generate_orders_loop(generator):
+    """Reference per-row order loop the vectorized engine replaced"""
+    current_date = generator.start_date
+    customers = list(generator.customers_data.records())
+
+    while current_date <= generator.end_date:
+        daily_orders = int(generator.daily_orders * random.uniform(0.7, 1.3))
+
+        if current_date.weekday() in [5, 6]:
+            daily_orders = int(daily_orders * 1.2)
+
+        for i in range(daily_orders):
+            customer = random.choice(customers)
+
+            # Generate GUARANTEED unique order ID
+            order_id = f"ORD-{generator.session_id[:4]}-{current_date.strftime('%Y%m%d')}-{str(generator.global_order_counter).zfill(6)}"
+
+            if customer['customer_id'] not in generator.valid_customer_ids:
+                raise ValueError(f"Invalid customer_id: {customer['customer_id']}")
+
+            order_time = time_of_day(
+                hour=random.randint(6, 23),
+                minute=random.randint(0, 59)
+            )
+
+            channel = customer['primary_channel']
+            segment = customer['customer_segment']
+
+            # Delivery expectations
+            if segment == 'PREMIUM':
+                delivery_days = random.randint(2, 4)
+            elif channel in ['AMAZON', 'FLIPKART']:
+                delivery_days = random.randint(3, 6)
+            else:
+                delivery_days = random.randint(4, 8)
+
+            customer_expectation = current_date.date() + timedelta(days=delivery_days)
+            promised_delivery = customer_expectation + timedelta(days=random.randint(0, 2))
+
+            # Order size based on segment
+            if segment == 'BULK':
+                total_items = random.randint(5, 15)
+                total_quantity = random.randint(20, 100)
+                gross_value = random.uniform(80000, 250000)
+            elif segment == 'PREMIUM':
+                total_items = random.randint(2, 6)
+                total_quantity = random.randint(3, 12)
+                gross_value = random.uniform(20000, 60000)
+            elif segment == 'PRICE_SENSITIVE':
+                total_items = random.randint(1, 3)
+                total_quantity = random.randint(1, 5)
+                gross_value = random.uniform(5000, 18000)
+            else:  # REGULAR
+                total_items = random.randint(1, 4)
+                total_quantity = random.randint(1, 8)
+                gross_value = random.uniform(10000, 35000)
+
+            # Payment method
+            if channel in ['AMAZON', 'FLIPKART']:
+                payment_method = np.random.choice(['PREPAID', 'COD'], p=[0.7, 0.3])
+            else:
+                payment_method = np.random.choice(['COD', 'PREPAID'], p=[0.6, 0.4])
+
+            # OTIF simulation
+            will_be_otif = random.random() < generator.otif_target
+
+            if will_be_otif:
+                actual_delivery = promised_delivery - timedelta(days=random.randint(0, 1))
+                delay_days = max(0, (actual_delivery - promised_delivery).days)
+                otif_status = 'ON_TIME_IN_FULL'
+                delivery_status = 'DELIVERED'
+                satisfaction = random.choice([4, 5])
+                nps = random.randint(7, 10)
+            else:
+                delay_days = random.randint(1, 6)
+                actual_delivery = promised_delivery + timedelta(days=delay_days)
+
+                if delay_days <= 2:
+                    otif_status = 'LATE'
+                    satisfaction = random.choice([3, 4])
+                    nps = random.randint(5, 7)
+                else:
+                    otif_status = np.random.choice(['LATE', 'INCOMPLETE'], p=[0.7, 0.3])
+                    satisfaction = random.choice([1, 2, 3])
+                    nps = random.randint(-5, 4)
+
+                delivery_status = 'DELIVERED' if otif_status != 'INCOMPLETE' else 'PARTIAL'
+
+            # Discounts
+            discount_rate = random.uniform(0.05, 0.12) if channel in ['WEBSITE', 'APP'] else 0
+            discount_amount = gross_value * discount_rate
+            net_value = gross_value - discount_amount
+
+            order = {
+                'order_id': order_id,
+                'customer_id': customer['customer_id'],
+                'order_date': current_date.date(),
+                'order_time': order_time,
+                'channel': channel,
+                'store_id': None,
+                'total_items': total_items,
+                'total_quantity': total_quantity,
+                'gross_order_value': round(gross_value, 2),
+                'discount_amount': round(discount_amount, 2),
+                'net_order_value': round(net_value, 2),
+                'payment_method': payment_method,
+                'payment_status': 'PAID' if payment_method == 'PREPAID' else 'PENDING',
+                'customer_delivery_expectation': customer_expectation,
+                'promised_delivery_date': promised_delivery,
+                'delivery_address_full': f"{fake.street_address()}, {customer['delivery_city']}, {customer['delivery_state']}",
+                'delivery_pincode': customer['pincode'],
+                'delivery_instructions': fake.sentence() if random.random() < 0.2 else None,
+                'order_priority': 'BULK' if segment == 'BULK' else 'STANDARD',
+                'is_trial_order': random.random() < 0.1,
+                'estimated_dispatch_date': promised_delivery - timedelta(days=2),
+                'actual_dispatch_date': actual_delivery - timedelta(days=1),
+                'estimated_delivery_date': promised_delivery,
+                'actual_delivery_date': actual_delivery,
+                'delivery_status': delivery_status,
+                'delivery_attempts': random.randint(1, 2) if delivery_status == 'DELIVERED' else 1,
+                'otif_status': otif_status,
+                'delay_days': delay_days,
+                'customer_satisfaction_rating': satisfaction,
+                'nps_score': nps
+            }
+
+            generator.orders_data.append(order)
+            generator.global_order_counter += 1
+
+        current_date += timedelta(days=1)
+
+
+
+def generate_order_line_items_loop(generator):
+    """Reference per-row line-item loop the vectorized engine replaced"""
+    print("Generating order line items...")
+
+    products = list(generator.products_data.records())
+
+    for order in generator.orders_data.records():
+        if order['order_id'] not in generator.valid_order_ids:
+            raise ValueError(f"Order ID not found: {order['order_id']}")
+
+        total_items = order['total_items']
+        order_value = order['gross_order_value']
+
+        remaining_value = order_value
+        remaining_items = total_items
+
+        for item_seq in range(total_items):
+            product = random.choice(products)
+
+            if product['sku_code'] not in generator.valid_sku_codes:
+                raise ValueError(f"SKU code not found: {product['sku_code']}")
+
+            line_item_id = f"LI-{order['order_id']}-{str(item_seq+1).zfill(3)}"
+
+            # Quantity logic
+            if order['order_priority'] == 'BULK':
+                quantity = random.randint(3, 15)
+            elif product['category'] == 'MATTRESS':
+                quantity = 1
+            elif product['category'] in ['PILLOW', 'BEDDING']:
+                quantity = random.randint(1, 4)
+            else:
+                quantity = random.randint(1, 2)
+
+            # Price calculation
+            if remaining_items == 1:
+                line_total = remaining_value
+                unit_price = line_total / quantity if quantity > 0 else 0
+            else:
+                target_value = remaining_value / remaining_items
+                unit_price = product['price_inr'] * random.uniform(0.95, 1.05)
+                line_total = unit_price * quantity
+
+                if line_total > remaining_value * 0.8:
+                    line_total = remaining_value * random.uniform(0.3, 0.7)
+                    unit_price = line_total / quantity if quantity > 0 else 0
+
+            manufacturing_facility = 'FAC-HOS-MFG'
+            if manufacturing_facility not in generator.valid_facility_ids:
+                raise ValueError(f"Manufacturing facility not found: {manufacturing_facility}")
+
+            estimated_manufacturing = pd.to_datetime(order['order_date']) + timedelta(days=random.randint(1, 3))
+
+            # Quality status
+            if order['otif_status'] == 'ON_TIME_IN_FULL':
+                qc_status = 'PASSED'
+                quantity_delivered = quantity
+                actual_manufacturing = estimated_manufacturing
+            elif order['otif_status'] == 'INCOMPLETE':
+                qc_status = random.choice(['PASSED', 'REWORK'])
+                quantity_delivered = int(quantity * random.uniform(0.5, 0.9))
+                actual_manufacturing = estimated_manufacturing + timedelta(days=random.randint(0, 2))
+            else:  # LATE
+                qc_status = 'PASSED'
+                quantity_delivered = quantity
+                actual_manufacturing = estimated_manufacturing + timedelta(days=random.randint(1, 3))
+
+            line_item = {
+                'line_item_id': line_item_id,
+                'order_id': order['order_id'],
+                'sku_code': product['sku_code'],
+                'quantity_ordered': quantity,
+                'quantity_confirmed': quantity,
+                'quantity_dispatched': quantity_delivered,
+                'quantity_delivered': quantity_delivered,
+                'unit_price': round(unit_price, 2),
+                'line_total': round(line_total, 2),
+                'customization_details': json.dumps({'color': 'custom'}) if product['is_customizable'] and random.random() < 0.15 else None,
+                'estimated_manufacturing_date': estimated_manufacturing.date(),
+                'actual_manufacturing_date': actual_manufacturing.date(),
+                'manufacturing_facility_id': manufacturing_facility,
+                'quality_check_status': qc_status,
+                'quality_check_date': actual_manufacturing.date() + timedelta(days=1),
+                'inventory_allocation_time': pd.to_datetime(order['order_date']) + timedelta(hours=random.randint(1, 12)),
+                'line_item_status': order['delivery_status'],
+                'dispatch_facility_id': manufacturing_facility
+            }
+
+            generator.order_line_items_data.append(line_item)
+            generator.global_line_item_counter += 1
+
+            remaining_value -= line_total
+            remaining_items -= 1
+
+            if remaining_value < 0:
+                remaining_value = 0
+
+    generator.build_order_line_index()
+    generator._accumulate_demand()
+    print(f"Generated {len(generator.order_line_items_data)} order line items")
+
+
+
+def generate_sales_movements_loop(generator):
+    """Reference per-row sales movement loop the vectorized engine replaced"""
+    print("Generating sales inventory movements...")
+
+    sales = 0
+    for line_item in generator.order_line_items_data.records():
+        if line_item['quantity_dispatched'] > 0:
+            if line_item['sku_code'] not in generator.valid_sku_codes:
+                raise ValueError(f"Invalid sku_code: {line_item['sku_code']}")
+
+            if line_item['dispatch_facility_id'] not in generator.valid_facility_ids:
+                raise ValueError(f"Invalid facility_id: {line_item['dispatch_facility_id']}")
+
+            if line_item['order_id'] not in generator.valid_order_ids:
+                raise ValueError(f"Invalid order_id: {line_item['order_id']}")
+
+            movement_id = generator.generate_unique_movement_id('SALE_OUT')
+
+            movement = {
+                'movement_id': movement_id,
+                'sku_code': line_item['sku_code'],
+                'facility_id': line_item['dispatch_facility_id'],
+                'movement_date': line_item['actual_manufacturing_date'],
+                'movement_time': time_of_day(hour=random.randint(14, 18)),
+                'movement_type': 'SALE_OUT',
+                'quantity_change': -line_item['quantity_dispatched'],
+                'previous_stock': random.randint(100, 500),
+                'new_stock': random.randint(50, 450),
+                'reference_id': line_item['order_id'],
+                'batch_number': None,
+                'expiry_date': None,
+                'cost_per_unit': line_item['unit_price'] * 0.6,
+                'movement_reason': f"Order dispatch - {line_item['order_id']}"
+            }
+            generator.inventory_movements_data.append(movement)
+            sales += 1
+
+    print(f"Generated {sales} sales movements")
+
+
+
+def generate_logistics_shipments_loop(generator):
+    """Reference per-row shipment loop the vectorized builder replaced"""
+    print("Generating logistics shipments...")
+
+    carriers = ['BLUEDART', 'DELHIVERY', 'ECOM_EXPRESS', 'DTDC', 'XPRESSBEES']
+
+    for order, order_lines in orders_with_line_items(generator):
+        if order['order_id'] not in generator.valid_order_ids:
+            raise ValueError(f"Invalid order_id: {order['order_id']}")
+
+        carrier = random.choice(carriers)
+
+        # Generate unique shipment ID (the counter runs across blocks)
+        shipment_id = f"SHIP-{carrier[:3]}-{generator.session_id[:4]}-{generator.global_shipment_counter:06d}"
+        generator.global_shipment_counter += 1
+
+        total_weight = sum([random.uniform(5, 100) for _ in order_lines])
+        total_volume = total_weight * random.uniform(1000, 3000)
+
+        distance = random.randint(100, 1500)
+        transportation_cost = (total_weight * 20) + (distance * 0.3) + random.uniform(200, 800)
+
+        num_attempts = 1 if order['delivery_status'] == 'DELIVERED' else random.randint(1, 3)
+        delivery_attempts = []
+
+        attempt_date = pd.to_datetime(order['actual_dispatch_date'])
+        for attempt in range(num_attempts):
+            attempt_date += timedelta(days=attempt)
+            delivery_attempts.append({
+                'attempt_number': attempt + 1,
+                'attempt_date': attempt_date.strftime('%Y-%m-%d'),
+                'attempt_time': f"{random.randint(9, 18):02d}:{random.randint(0, 59):02d}",
+                'status': 'DELIVERED' if (attempt == num_attempts - 1 and order['delivery_status'] == 'DELIVERED') else 'FAILED',
+                'reason': None if order['delivery_status'] == 'DELIVERED' else random.choice(['CUSTOMER_NOT_AVAILABLE', 'ADDRESS_ISSUE'])
+            })
+
+        dispatch_facility = 'FAC-HOS-MFG'
+        if dispatch_facility not in generator.valid_facility_ids:
+            raise ValueError(f"Invalid dispatch_facility_id: {dispatch_facility}")
+
+        shipment = {
+            'shipment_id': shipment_id,
+            'order_id': order['order_id'],
+            'carrier_name': carrier,
+            'tracking_number': f"{carrier[:3]}{random.randint(100000000, 999999999)}",
+            'dispatch_facility_id': dispatch_facility,
+            'dispatch_date': order['actual_dispatch_date'],
+            'dispatch_time': f"{random.randint(8, 17):02d}:{random.randint(0, 59):02d}",
+            'delivery_address_verified': order['delivery_address_full'],
+            'delivery_pincode': order['delivery_pincode'],
+            'estimated_delivery_date': order['estimated_delivery_date'],
+            'attempted_delivery_dates': json.dumps(delivery_attempts),
+            'successful_delivery_date': order['actual_delivery_date'] if order['delivery_status'] == 'DELIVERED' else None,
+            'successful_delivery_time': f"{random.randint(9, 18):02d}:{random.randint(0, 59):02d}" if order['delivery_status'] == 'DELIVERED' else None,
+            'delivery_person_name': generator.faker_pools.choice('name') if order['delivery_status'] == 'DELIVERED' else None,
+            'delivery_otp': str(random.randint(100000, 999999)) if order['delivery_status'] == 'DELIVERED' else None,
+            'customer_signature_received': order['delivery_status'] == 'DELIVERED',
+            'delivery_photos': json.dumps([f"photo_{i}.jpg" for i in range(random.randint(1, 3))]) if order['delivery_status'] == 'DELIVERED' else None,
+            'total_weight_kg': round(total_weight, 2),
+            'total_volume_cubic_cm': round(total_volume, 2),
+            'transportation_cost': round(transportation_cost, 2),
+            'distance_km': distance,
+            'delivery_rating_by_customer': order['customer_satisfaction_rating'],
+            'delivery_issues': random.choice(['TRAFFIC_DELAY', 'VEHICLE_BREAKDOWN', 'WEATHER']) if order['delay_days'] > 2 else None,
+            'return_initiated': random.random() < 0.05
+        }
+
+        generator.logistics_shipments_data.append(shipment)
+
+    print(f"Generated {len(generator.logistics_shipments_data)} logistics shipments")
+
+
+
+def generate_supply_chain_events_loop(generator):
+    """Reference per-row event loop the vectorized engine replaced"""
+    print("Generating supply chain events...")
+
+    for order, order_lines in orders_with_line_items(generator):
+        if order['order_id'] not in generator.valid_order_ids:
+            raise ValueError(f"Invalid order_id: {order['order_id']}")
+
+        order_date = pd.to_datetime(order['order_date'])
+        current_time = order_date
+
+        # Order received event
+        event_id = generator.generate_unique_event_id()
+        generator.supply_chain_events_data.append({
+            'event_id': event_id,
+            'related_order_id': order['order_id'],
+            'related_sku_code': None,
+            'facility_id': None,
+            'event_type': 'ORDER_RECEIVED',
+            'event_timestamp': current_time,
+            'expected_completion_time': current_time + timedelta(minutes=30),
+            'actual_completion_time': current_time + timedelta(minutes=random.randint(15, 45)),
+            'duration_minutes': random.randint(15, 45),
+            'delay_minutes': max(0, random.randint(-15, 15)),
+            'delay_category': 'NO_DELAY',
+            'delay_root_cause': None,
+            'responsible_team': 'SALES',
+            'resolution_action': 'Order processed successfully',
+            'impact_on_customer': 'NONE',
+            'cost_of_delay': 0
+        })
+        current_time += timedelta(hours=1)
+
+        # Events for each line item
+        for line_item in order_lines:
+            if line_item['sku_code'] not in generator.valid_sku_codes:
+                raise ValueError(f"Invalid sku_code: {line_item['sku_code']}")
+
+            facility_id = 'FAC-HOS-MFG'
+            if facility_id not in generator.valid_facility_ids:
+                raise ValueError(f"Invalid facility_id: {facility_id}")
+
+            # Inventory allocation
+            delay = random.randint(0, 180) if random.random() < 0.1 else 0
+            event_id = generator.generate_unique_event_id()
+            generator.supply_chain_events_data.append({
+                'event_id': event_id,
+                'related_order_id': order['order_id'],
+                'related_sku_code': line_item['sku_code'],
+                'facility_id': facility_id,
+                'event_type': 'INVENTORY_ALLOCATED',
+                'event_timestamp': current_time,
+                'expected_completion_time': current_time + timedelta(hours=2),
+                'actual_completion_time': current_time + timedelta(hours=2, minutes=delay),
+                'duration_minutes': 120 + delay,
+                'delay_minutes': delay,
+                'delay_category': 'INVENTORY_SHORTAGE' if delay > 0 else 'NO_DELAY',
+                'delay_root_cause': 'Stock shortage' if delay > 0 else None,
+                'responsible_team': 'INVENTORY',
+                'resolution_action': 'Inventory allocated',
+                'impact_on_customer': 'NONE' if delay == 0 else 'MINOR',
+                'cost_of_delay': delay * 0.5
+            })
+
+            # Production events
+            prod_delay = random.randint(0, 720) if random.random() < 0.15 else 0
+            prod_time = pd.to_datetime(line_item['actual_manufacturing_date'])
+
+            event_id = generator.generate_unique_event_id()
+            generator.supply_chain_events_data.append({
+                'event_id': event_id,
+                'related_order_id': order['order_id'],
+                'related_sku_code': line_item['sku_code'],
+                'facility_id': facility_id,
+                'event_type': 'PRODUCTION_COMPLETED',
+                'event_timestamp': prod_time + timedelta(minutes=prod_delay),
+                'expected_completion_time': prod_time,
+                'actual_completion_time': prod_time + timedelta(minutes=prod_delay),
+                'duration_minutes': prod_delay,
+                'delay_minutes': prod_delay,
+                'delay_category': random.choice(['SUPPLIER_DELAY', 'EQUIPMENT_ISSUE', 'LABOR_SHORTAGE']) if prod_delay > 0 else 'NO_DELAY',
+                'delay_root_cause': 'Production delays' if prod_delay > 0 else None,
+                'responsible_team': 'PRODUCTION',
+                'resolution_action': 'Production completed',
+                'impact_on_customer': 'NONE' if prod_delay <= 240 else 'MODERATE',
+                'cost_of_delay': prod_delay * 1.2
+            })
+
+            # Quality check
+            qc_delay = random.randint(60, 480) if line_item['quality_check_status'] == 'REWORK' else 0
+            qc_time = pd.to_datetime(line_item['quality_check_date'])
+
+            event_id = generator.generate_unique_event_id()
+            generator.supply_chain_events_data.append({
+                'event_id': event_id,
+                'related_order_id': order['order_id'],
+                'related_sku_code': line_item['sku_code'],
+                'facility_id': facility_id,
+                'event_type': 'QC_COMPLETED',
+                'event_timestamp': qc_time + timedelta(minutes=qc_delay),
+                'expected_completion_time': qc_time,
+                'actual_completion_time': qc_time + timedelta(minutes=qc_delay),
+                'duration_minutes': 60 + qc_delay,
+                'delay_minutes': qc_delay,
+                'delay_category': 'QUALITY_ISSUE' if qc_delay > 0 else 'NO_DELAY',
+                'delay_root_cause': 'Quality rework required' if qc_delay > 0 else None,
+                'responsible_team': 'QC',
+                'resolution_action': 'Quality approved',
+                'impact_on_customer': 'NONE' if qc_delay == 0 else 'MODERATE',
+                'cost_of_delay': qc_delay * 0.8
+            })
+
+        # Dispatch event
+        dispatch_delay = order['delay_days'] * 60 if order['delay_days'] > 0 else 0
+        dispatch_time = pd.to_datetime(order['actual_dispatch_date'])
+        dispatch_facility = 'FAC-HOS-MFG'
+
+        if dispatch_facility not in generator.valid_facility_ids:
+            raise ValueError(f"Invalid dispatch facility: {dispatch_facility}")
+
+        event_id = generator.generate_unique_event_id()
+        generator.supply_chain_events_data.append({
+            'event_id': event_id,
+            'related_order_id': order['order_id'],
+            'related_sku_code': None,
+            'facility_id': dispatch_facility,
+            'event_type': 'DISPATCHED',
+            'event_timestamp': dispatch_time,
+            'expected_completion_time': pd.to_datetime(order['estimated_dispatch_date']),
+            'actual_completion_time': dispatch_time,
+            'duration_minutes': 120,
+            'delay_minutes': dispatch_delay,
+            'delay_category': random.choice(['LOGISTICS_ISSUE', 'PACKAGING_DELAY']) if dispatch_delay > 0 else 'NO_DELAY',
+            'delay_root_cause': 'Dispatch coordination' if dispatch_delay > 0 else None,
+            'responsible_team': 'LOGISTICS',
+            'resolution_action': 'Order dispatched',
+            'impact_on_customer': 'NONE' if dispatch_delay <= 120 else 'MAJOR',
+            'cost_of_delay': dispatch_delay * 1.5
+        })
+
+        # Delivery event
+        delivery_delay = order['delay_days'] * 1440 if order['delay_days'] > 0 else 0
+        delivery_time = pd.to_datetime(order['actual_delivery_date'])
+
+        event_id = generator.generate_unique_event_id()
+        generator.supply_chain_events_data.append({
+            'event_id': event_id,
+            'related_order_id': order['order_id'],
+            'related_sku_code': None,
+            'facility_id': None,
+            'event_type': 'DELIVERED',
+            'event_timestamp': delivery_time,
+            'expected_completion_time': pd.to_datetime(order['promised_delivery_date']),
+            'actual_completion_time': delivery_time,
+            'duration_minutes': 30,
+            'delay_minutes': delivery_delay,
+            'delay_category': random.choice(['TRAFFIC_DELAY', 'CUSTOMER_UNAVAILABLE']) if delivery_delay > 0 else 'NO_DELAY',
+            'delay_root_cause': 'Last mile delivery issues' if delivery_delay > 0 else None,
+            'responsible_team': 'LOGISTICS',
+            'resolution_action': 'Successfully delivered',
+            'impact_on_customer': 'NONE' if delivery_delay == 0 else 'MAJOR',
+            'cost_of_delay': delivery_delay * 2.0
+        })
+
+    print(f"Generated {len(generator.supply_chain_events_data)} supply chain events")
+
+
+def time_phase(generator, phase):
+    """Run one generation phase silently and return (seconds, orders frame)"""
+    generator.orders_data = ColumnarTable('orders', TABLE_SCHEMAS['orders'])
+    generator.global_order_counter = 1
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        phase()
+    elapsed = time.perf_counter() - started
+    return elapsed, generator.orders_data.to_frame()
+
+
+def order_statistics(orders):
+    """Distribution summary used to check the engines agree"""
+    promised = pd.to_datetime(orders['promised_delivery_date'])
+    ordered = pd.to_datetime(orders['order_date'])
+    return {
+        'orders': len(orders),
+        'mean_gross_value': orders['gross_order_value'].mean(),
+        'mean_total_items': orders['total_items'].mean(),
+        'mean_promise_days': (promised - ordered).dt.days.mean(),
+        'otif_rate': (orders['otif_status'] == 'ON_TIME_IN_FULL').mean(),
+        'incomplete_rate': (orders['otif_status'] == 'INCOMPLETE').mean(),
+        'prepaid_share': (orders['payment_method'] == 'PREPAID').mean(),
+        'mean_delay_days': orders['delay_days'].mean(),
+        'mean_nps': orders['nps_score'].mean(),
+    }
+
+
+def benchmark_orders(days, daily_orders):
+    """Compare the per-row order loop with the vectorized order engine"""
+    print(f"Orders benchmark: {days} days x ~{daily_orders:,} orders/day")
+    print("-" * 60)
+
+    results = {}
+    with tempfile.TemporaryDirectory() as output_dir:
+        generator = build_generator(output_dir, days, daily_orders)
+        for engine, phase in [('loop', partial(generate_orders_loop, generator)),
+                              ('vectorized', generator.generate_orders)]:
+            elapsed, orders = time_phase(generator, phase)
+            results[engine] = (elapsed, order_statistics(orders))
+            print(f"  {engine:<12} {len(orders):>10,} orders  {elapsed:8.2f}s  {len(orders) / elapsed:>12,.0f} orders/s")
+
+    loop_time, loop_stats = results['loop']
+    vector_time, vector_stats = results['vectorized']
+    print(f"  Speedup: {loop_time / vector_time:.1f}x")
+
+    print("\n  Distribution check (loop vs vectorized):")
+    for metric in loop_stats:
+        print(f"    {metric:<20} {loop_stats[metric]:>14,.3f} {vector_stats[metric]:>14,.3f}")
+    print()
+
+
+def line_item_statistics(line_items):
+    """Distribution summary used to check the line-item engines agree"""
+    ordered = pd.to_datetime(line_items['inventory_allocation_time']).dt.normalize()
+    manufactured = pd.to_datetime(line_items['actual_manufacturing_date'])
+    return {
+        'line_items': len(line_items),
+        'mean_quantity': line_items['quantity_ordered'].mean(),
+        'mean_line_total': line_items['line_total'].mean(),
+        'fill_rate': line_items['quantity_delivered'].sum() / line_items['quantity_ordered'].sum(),
+        'rework_rate': (line_items['quality_check_status'] == 'REWORK').mean(),
+        'customized_share': line_items['customization_details'].notna().mean(),
+        'mean_build_days': (manufactured - ordered).dt.days.mean(),
+    }
+
+
+def benchmark_line_items(days, daily_orders):
+    """Compare the per-row line-item loop with the vectorized line-item engine on the same orders"""
+    print(f"Line items benchmark: {days} days x ~{daily_orders:,} orders/day")
+    print("-" * 60)
+
+    results = {}
+    with tempfile.TemporaryDirectory() as output_dir:
+        generator = build_generator(output_dir, days, daily_orders)
+        with contextlib.redirect_stdout(io.StringIO()):
+            generator.generate_orders()
+            generator.validate_orders()
+        for engine, phase in [('loop', partial(generate_order_line_items_loop, generator)),
+                              ('vectorized', generator.generate_order_line_items)]:
+            generator.order_line_items_data = ColumnarTable('order_line_items', TABLE_SCHEMAS['order_line_items'])
+            started = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                phase()
+            elapsed = time.perf_counter() - started
+            line_items = generator.order_line_items_data.to_frame()
+            results[engine] = (elapsed, line_item_statistics(line_items))
+            print(f"  {engine:<12} {len(line_items):>10,} items   {elapsed:8.2f}s  {len(line_items) / elapsed:>12,.0f} items/s")
+
+    loop_time, loop_stats = results['loop']
+    vector_time, vector_stats = results['vectorized']
+    print(f"  Speedup: {loop_time / vector_time:.1f}x")
+
+    print("\n  Distribution check (loop vs vectorized):")
+    for metric in loop_stats:
+        print(f"    {metric:<20} {loop_stats[metric]:>14,.3f} {vector_stats[metric]:>14,.3f}")
+    print()
+
+
+def event_statistics(events):
+    """Distribution summary used to check the event engines agree"""
+    delayed = events['delay_minutes'] > 0
+    return {
+        'events': len(events),
+        'delayed_share': delayed.mean(),
+        'mean_delay_minutes': events['delay_minutes'].mean(),
+        'mean_duration_minutes': events['duration_minutes'].mean(),
+        'mean_cost_of_delay': events['cost_of_delay'].mean(),
+        'major_impact_share': (events['impact_on_customer'] == 'MAJOR').mean(),
+        'line_event_share': events['related_sku_code'].notna().mean(),
+    }
+
+
+def benchmark_events(days, daily_orders):
+    """Compare the per-row event loop with the vectorized event engine on the same orders and line items"""
+    print(f"Supply chain events benchmark: {days} days x ~{daily_orders:,} orders/day")
+    print("-" * 60)
+
+    results = {}
+    with tempfile.TemporaryDirectory() as output_dir:
+        generator = build_generator(output_dir, days, daily_orders)
+        with contextlib.redirect_stdout(io.StringIO()):
+            generator.generate_orders()
+            generator.validate_orders()
+            generator.generate_order_line_items()
+        for engine, phase in [('loop', partial(generate_supply_chain_events_loop, generator)),
+                              ('vectorized', generator.generate_supply_chain_events)]:
+            generator.supply_chain_events_data = ColumnarTable('supply_chain_events', TABLE_SCHEMAS['supply_chain_events'])
+            generator.global_event_counter = 1
+            started = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                phase()
+            elapsed = time.perf_counter() - started
+            events = generator.supply_chain_events_data.to_frame()
+            results[engine] = (elapsed, event_statistics(events))
+            print(f"  {engine:<12} {len(events):>10,} events  {elapsed:8.2f}s  {len(events) / elapsed:>12,.0f} events/s")
+
+    loop_time, loop_stats = results['loop']
+    vector_time, vector_stats = results['vectorized']
+    print(f"  Speedup: {loop_time / vector_time:.1f}x")
+
+    print("\n  Distribution check (loop vs vectorized):")
+    for metric in loop_stats:
+        print(f"    {metric:<22} {loop_stats[metric]:>14,.3f} {vector_stats[metric]:>14,.3f}")
+    print()
+
+
+def shipment_statistics(shipments):
+    """Distribution summary used to check the shipment builders agree"""
+    attempts = shipments['attempted_delivery_dates'].str.count('"attempt_number"')
+    return {
+        'shipments': len(shipments),
+        'mean_weight_kg': shipments['total_weight_kg'].mean(),
+        'mean_distance_km': shipments['distance_km'].mean(),
+        'mean_cost': shipments['transportation_cost'].mean(),
+        'mean_attempts': attempts.mean(),
+        'signed_share': shipments['customer_signature_received'].mean(),
+        'issue_share': shipments['delivery_issues'].notna().mean(),
+        'return_share': shipments['return_initiated'].mean(),
+    }
+
+
+def benchmark_shipments(days, daily_orders):
+    """Compare the per-row shipment loop with the vectorized shipment builder on the same orders"""
+    print(f"Logistics shipments benchmark: {days} days x ~{daily_orders:,} orders/day")
+    print("-" * 60)
+
+    results = {}
+    with tempfile.TemporaryDirectory() as output_dir:
+        generator = build_generator(output_dir, days, daily_orders)
+        with contextlib.redirect_stdout(io.StringIO()):
+            generator.generate_orders()
+            generator.validate_orders()
+            generator.generate_order_line_items()
+        for engine, phase in [('loop', partial(generate_logistics_shipments_loop, generator)),
+                              ('vectorized', generator.generate_logistics_shipments)]:
+            generator.logistics_shipments_data = ColumnarTable('logistics_shipments', TABLE_SCHEMAS['logistics_shipments'])
+            generator.global_shipment_counter = 1
+            started = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                phase()
+            elapsed = time.perf_counter() - started
+            shipments = generator.logistics_shipments_data.to_frame()
+            results[engine] = (elapsed, shipment_statistics(shipments))
+            print(f"  {engine:<12} {len(shipments):>10,} shipments  {elapsed:8.2f}s  {len(shipments) / elapsed:>12,.0f} shipments/s")
+
+    loop_time, loop_stats = results['loop']
+    vector_time, vector_stats = results['vectorized']
+    print(f"  Speedup: {loop_time / vector_time:.1f}x")
+
+    print("\n  Distribution check (loop vs vectorized):")
+    for metric in loop_stats:
+        print(f"    {metric:<20} {loop_stats[metric]:>14,.3f} {vector_stats[metric]:>14,.3f}")
+    print()
+
+
+def benchmark_movements(days, daily_orders, ledger_rows):
+    """Compare the per-row sales movement loop with the vectorized engine, then time ledger posting"""
+    print(f"Inventory movements benchmark: {days} days x ~{daily_orders:,} orders/day")
+    print("-" * 60)
+
+    results = {}
+    with tempfile.TemporaryDirectory() as output_dir:
+        generator = build_generator(output_dir, days, daily_orders)
+        with contextlib.redirect_stdout(io.StringIO()):
+            generator.generate_orders()
+            generator.validate_orders()
+            generator.generate_order_line_items()
+        for engine, phase in [('loop', partial(generate_sales_movements_loop, generator)),
+                              ('vectorized', generator.generate_sales_movements)]:
+            generator.inventory_movements_data = ColumnarTable('inventory_movements', TABLE_SCHEMAS['inventory_movements'])
+            started = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                phase()
+            elapsed = time.perf_counter() - started
+            results[engine] = elapsed
+            movements = len(generator.inventory_movements_data)
+            print(f"  {engine:<12} {movements:>10,} moves   {elapsed:8.2f}s  {movements / elapsed:>12,.0f} moves/s")
+        print(f"  Speedup: {results['loop'] / results['vectorized']:.1f}x")
+
+        # Post a ledger of ledger_rows movements, tiled from the generated ones
+        sales = generator.inventory_movements_data
+        movements = sales.take(np.resize(np.arange(len(sales)), ledger_rows))
+        with contextlib.redirect_stdout(io.StringIO()):
+            generator.open_inventory_ledger()
+        started = time.perf_counter()
+        generator.inventory_ledger.post(movements)
+        elapsed = time.perf_counter() - started
+        print(f"  Ledger post  {ledger_rows:>10,} moves   {elapsed:8.2f}s  {ledger_rows / elapsed:>12,.0f} moves/s"
+              f"  ({generator.inventory_ledger.stockouts:,} stockouts)")
+    print()
+
+
+def benchmark_text_columns(rows):
+    """Compare per-row Faker calls with index draws from the pre-sampled value pools"""
+    print(f"Text columns benchmark: {rows:,} values per provider")
+    print("-" * 60)
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        started = time.perf_counter()
+        FakerValuePools(cache_dir=cache_dir).pool('street_address')
+        sampled = time.perf_counter() - started
+        started = time.perf_counter()
+        pools = FakerValuePools(cache_dir=cache_dir)
+        pools.pool('street_address')
+        cached = time.perf_counter() - started
+    print(f"  Pool setup: {sampled:.2f}s sampled, {cached:.3f}s from cache")
+
+    rng = np.random.default_rng(0)
+    total_faker = total_pool = 0.0
+    for provider in FakerValuePools.POOL_SIZES:
+        method = getattr(fake, provider)
+        started = time.perf_counter()
+        for _ in range(rows):
+            method()
+        faker_time = time.perf_counter() - started
+        started = time.perf_counter()
+        pools.draw(provider, rng, rows)
+        pool_time = time.perf_counter() - started
+        total_faker += faker_time
+        total_pool += pool_time
+        print(f"  {provider:<16} faker {faker_time:8.3f}s  pool {pool_time:8.4f}s  speedup {faker_time / pool_time:>8,.0f}x")
+    print(f"  Overall speedup (including cached pool setup): {total_faker / (total_pool + cached):,.0f}x")
+    print()
+
+
+def output_digest(output_dir):
+    """Digest of every generated data file, to check runs produced identical output"""
+    digest = hashlib.sha256()
+    for filename in sorted(os.listdir(output_dir)):
+        if filename.endswith('.csv') and filename != 'dataset_summary.csv':
+            with open(os.path.join(output_dir, filename), 'rb') as f:
+                digest.update(f.read())
+    return digest.hexdigest()
+
+
+def run_full(days, daily_orders, **options):
+    """Generate a full dataset with the given generator options; return (seconds, output digest, orders)"""
+    start = datetime(2024, 1, 1)
+    end = start + timedelta(days=days - 1)
+    with tempfile.TemporaryDirectory() as output_dir, contextlib.redirect_stdout(io.StringIO()):
+        started = time.perf_counter()
+        generator = WakefitFinalDataGenerator(
+            output_dir=output_dir,
+            start_date=start.strftime('%Y-%m-%d'),
+            end_date=end.strftime('%Y-%m-%d'),
+            daily_orders=daily_orders,
+            **options
+        )
+        generator.generate_all_data()
+        elapsed = time.perf_counter() - started
+        return elapsed, output_digest(output_dir), generator.sink.rows['orders']
+
+
+def benchmark_shards(days, daily_orders, worker_counts):
+    """Time full sharded runs across worker counts and check their output is identical"""
+    print(f"Sharded generation benchmark: {days} days x ~{daily_orders:,} orders/day")
+    print("-" * 60)
+
+    results = {}
+    for workers in worker_counts:
+        elapsed, digest, orders = run_full(days, daily_orders, workers=workers)
+        results[workers] = (elapsed, digest)
+        print(f"  {workers:>2} workers {orders:>10,} orders  {elapsed:8.2f}s  {orders / elapsed:>12,.0f} orders/s"
+              f"  speedup {results[worker_counts[0]][0] / elapsed:.2f}x")
+
+    identical = len({digest for _, digest in results.values()}) == 1
+    print(f"  Output identical across worker counts: {'yes' if identical else 'NO'}")
+    print()
+
+
+def benchmark_memory_limits(days, daily_orders, memory_limits):
+    """Time full runs under memory ceilings and check their output matches an unlimited run"""
+    print(f"Memory ceiling benchmark: {days} days x ~{daily_orders:,} orders/day")
+    print("-" * 60)
+
+    results = {}
+    for limit_mb in [None] + memory_limits:
+        elapsed, digest, orders = run_full(days, daily_orders, memory_limit_mb=limit_mb)
+        results[limit_mb] = (elapsed, digest)
+        label = f"{limit_mb:,.0f} MB" if limit_mb else "no limit"
+        print(f"  {label:>10} {orders:>10,} orders  {elapsed:8.2f}s  {orders / elapsed:>12,.0f} orders/s")
+
+    identical = len({digest for _, digest in results.values()}) == 1
+    print(f"  Output identical across memory limits: {'yes' if identical else 'NO'}")
+    print()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Wakefit data generation engines")
+    parser.add_argument('--days', type=int, default=30, help="number of days to generate")
+    parser.add_argument('--daily-orders', type=int, default=2000, help="target orders per day")
+    parser.add_argument('--ledger-rows', type=int, default=10_000_000, help="movements posted in the ledger benchmark")
+    parser.add_argument('--workers', type=int, nargs='*', default=[],
+                        help="also time full sharded runs with these worker counts, e.g. --workers 1 2 4")
+    parser.add_argument('--memory-limits', type=float, nargs='*', default=[],
+                        help="also time full runs under these memory ceilings in MB, e.g. --memory-limits 5 500")
+    args = parser.parse_args()
+
+    print("Wakefit Data Generator Benchmarks")
+    print("=" * 60)
+    benchmark_orders(args.days, args.daily_orders)
+    benchmark_line_items(args.days, args.daily_orders)
+    benchmark_events(args.days, args.daily_orders)
+    benchmark_shipments(args.days, args.daily_orders)
+    benchmark_movements(args.days, args.daily_orders, args.ledger_rows)
+    benchmark_text_columns(args.days * args.daily_orders)
+    if args.workers:
+        benchmark_shards(args.days, args.daily_orders, args.workers)
+    if args.memory_limits:
+        benchmark_memory_limits(args.days, args.daily_orders, args.memory_limits)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
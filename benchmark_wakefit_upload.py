@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Wakefit Data Upload Benchmarks
+Measures load throughput of COPY FROM STDIN against the batched INSERT path
+on a PostgreSQL instance configured like upload_wakefit_data.py (.env / DB_*)
+"""
+
+import argparse
+import contextlib
+import io
+import sys
+import time
+
+from upload_wakefit_data import CSV_FOLDER, DATA_FORMAT, POSTGRES_CONFIG, TABLES, WakefitDataUploader
+
+
+def table_counts(uploader):
+    """Row count of every table after a load"""
+    cursor = uploader.conn.cursor()
+    counts = {}
+    for table in TABLES:
+        cursor.execute(f"SELECT COUNT(*) FROM {table}")
+        counts[table] = cursor.fetchone()[0]
+    cursor.close()
+    return counts
+
+
+def time_load(data_dir, data_format, load_method):
+    """Load every table with one method and return (seconds per table, row counts)"""
+    uploader = WakefitDataUploader(data_dir, POSTGRES_CONFIG, data_format=data_format, load_method=load_method)
+    with contextlib.redirect_stdout(io.StringIO()):
+        if not uploader.connect_db():
+            raise RuntimeError("Database connection failed")
+    try:
+        timings = {}
+        for table in TABLES:
+            started = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                loaded = uploader.upload_table(table)
+            if not loaded:
+                raise RuntimeError(f"{load_method}: loading {table} failed")
+            timings[table] = time.perf_counter() - started
+        return timings, table_counts(uploader)
+    finally:
+        uploader.close_db()
+
+
+def benchmark_loads(data_dir, data_format, methods):
+    """Compare load methods table by table"""
+    print(f"Upload benchmark: {data_dir} ({data_format}) -> {POSTGRES_CONFIG['host']}/{POSTGRES_CONFIG['database']}")
+    print("-" * 60)
+
+    results = {method: time_load(data_dir, data_format, method) for method in methods}
+
+    print(f"  {'table':<22}" + "".join(f"{method:>12}" for method in methods) + f"{'rows':>12}")
+    for table in TABLES:
+        rows = results[methods[0]][1][table]
+        print(f"  {table:<22}" + "".join(f"{results[method][0][table]:>11.2f}s" for method in methods) + f"{rows:>12,}")
+
+    total_rows = sum(results[methods[0]][1].values())
+    for method in methods:
+        elapsed = sum(results[method][0].values())
+        print(f"  {method:<12} {total_rows:>10,} rows  {elapsed:8.2f}s  {total_rows / elapsed:>12,.0f} rows/s")
+    if len(methods) > 1:
+        baseline = sum(results[methods[-1]][0].values())
+        print(f"  Speedup of {methods[0]} over {methods[-1]}: {baseline / sum(results[methods[0]][0].values()):.1f}x")
+
+    identical = all(results[method][1] == results[methods[0]][1] for method in methods)
+    print(f"  Row counts identical across methods: {'yes' if identical else 'NO'}")
+    print()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Wakefit data upload methods")
+    parser.add_argument('--data-dir', default=CSV_FOLDER, help="folder with the generated table files")
+    parser.add_argument('--format', choices=('auto', 'csv', 'parquet'), default=DATA_FORMAT, help="input file format")
+    parser.add_argument('--methods', nargs='+', choices=('copy', 'insert'), default=['copy', 'insert'],
+                        help="load methods to time; the speedup compares the first with the last")
+    args = parser.parse_args()
+
+    if not POSTGRES_CONFIG['password']:
+        print("Error: Database password not set (DB_PASSWORD)")
+        return 1
+
+    print("Wakefit Data Upload Benchmarks")
+    print("=" * 60)
+    benchmark_loads(args.data_dir, args.format, args.methods)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,13 +4,24 @@ Wakefit Supply Chain Data Upload Script with .env support
 Uploads CSV data to PostgreSQL database
 """
 
+import argparse
+import csv
+import io
+import json
 import pandas as pd
 import psycopg2
 from psycopg2.extras import execute_values
 import os
+import re
 import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from pathlib import Path
 from datetime import datetime
+from psycopg2.pool import ThreadedConnectionPool
+
+from create_wakefit_database import table_dependencies
 
 # Load environment variables from .env file
 try:
@@ -33,6 +44,60 @@ POSTGRES_CONFIG = {
 # CSV folder path from environment variable
 CSV_FOLDER = os.environ.get('CSV_FOLDER', r"C:/Turinton/universal_data_generatsions/wakefit_data_optimized")
 
+# Input file format: 'csv', 'parquet', or 'auto' to prefer a table's Parquet file when one exists
+DATA_FORMAT = os.environ.get('DATA_FORMAT', 'auto')
+
+# Load method: 'copy' streams files through COPY FROM STDIN, 'insert' uses batched INSERT statements
+LOAD_METHOD = os.environ.get('LOAD_METHOD', 'copy')
+
+# Rows converted to CSV text at a time when COPY is fed from frames rather than a CSV file
+COPY_CHUNK_ROWS = int(os.environ.get('COPY_CHUNK_ROWS', 50_000))
+
+# Files larger than COPY_CHUNK_MB are split into chunks of about that size (CSV byte ranges or Parquet
+# row groups), COPYed in parallel over COPY_CHUNK_WORKERS connections into a staging table and merged
+# in one transaction; a chunk hitting a connection or deadlock error is retried COPY_CHUNK_RETRIES times
+COPY_CHUNK_MB = float(os.environ.get('COPY_CHUNK_MB', 64))
+COPY_CHUNK_WORKERS = int(os.environ.get('COPY_CHUNK_WORKERS', 4))
+COPY_CHUNK_RETRIES = int(os.environ.get('COPY_CHUNK_RETRIES', 3))
+
+# Tables loaded concurrently, each over its own pooled connection (1 = one table at a time)
+UPLOAD_WORKERS = int(os.environ.get('UPLOAD_WORKERS', 4))
+
+# Loading connections an upload opens at once, besides its own control connection. Every table in
+# flight holds one and its chunked COPY pool opens more, so the chunk pools share what is left: chunk
+# workers are capped at (UPLOAD_MAX_CONNECTIONS - workers) // workers, and chunking is off when that
+# leaves one or none. Keep it under the server's max_connections minus whatever else connects
+UPLOAD_MAX_CONNECTIONS = int(os.environ.get('UPLOAD_MAX_CONNECTIONS', 16))
+
+# Bulk-load mode for full reloads: keys, indexes and foreign keys are dropped and the tables made
+# UNLOGGED while loading, then everything is rebuilt in parallel and foreign keys re-validated
+BULK_LOAD = os.environ.get('BULK_LOAD', 'false').lower() in ('1', 'true', 'yes')
+
+# Shadow-load mode: each table loads into <table>__staging, gets its keys, indexes and foreign keys and
+# is analyzed there, then replaces the live table by rename in one short transaction, so readers never
+# see it empty. The swap waits at most SWAP_LOCK_TIMEOUT_MS for readers' locks, SWAP_RETRIES times
+SHADOW_LOAD = os.environ.get('SHADOW_LOAD', 'false').lower() in ('1', 'true', 'yes')
+SWAP_LOCK_TIMEOUT_MS = int(os.environ.get('SWAP_LOCK_TIMEOUT_MS', 2000))
+SWAP_RETRIES = int(os.environ.get('SWAP_RETRIES', 5))
+
+# Delta mode: each file is upserted on the table's primary key instead of replacing the table; only
+# rows that are new or whose content hash differs from the stored row are written, none are deleted
+DELTA_LOAD = os.environ.get('DELTA_LOAD', 'false').lower() in ('1', 'true', 'yes')
+
+# Tables whose file still matches the generator's manifest.json entry recorded in MANIFEST_TABLE when
+# they were last loaded are skipped; FORCE_RELOAD=true loads every table regardless
+FORCE_RELOAD = os.environ.get('FORCE_RELOAD', 'false').lower() in ('1', 'true', 'yes')
+MANIFEST_TABLE = 'upload_manifest'
+
+# Durable load journal: tables completed and chunks committed by the current run, each recorded in the
+# transaction that loaded it, so a run started with --resume continues where an interrupted one stopped
+JOURNAL_TABLE = 'upload_journal'
+CHUNK_JOURNAL_TABLE = 'upload_journal_chunks'
+
+# Row counts come from the loads themselves (and pg_class.reltuples estimates for tables not loaded);
+# VERIFY_COUNTS=true (or --verify) also checks every loaded table with a full-scan COUNT(*)
+VERIFY_COUNTS = os.environ.get('VERIFY_COUNTS', 'false').lower() in ('1', 'true', 'yes')
+
 # Tables in dependency order
 TABLES = [
     'customers',
@@ -49,12 +114,237 @@ TABLES = [
     'supply_chain_events'
 ]
 
+class CopyStream(io.TextIOBase):
+    """Read-only text file over an iterator of CSV chunks, so COPY pulls rows as they are produced"""
+    
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+        self._chunk = ''
+        self._position = 0
+    
+    def readable(self):
+        return True
+    
+    def read(self, size=-1):
+        parts = []
+        while size != 0:
+            if self._position >= len(self._chunk):
+                self._chunk = next(self._chunks, None)
+                self._position = 0
+                if self._chunk is None:
+                    self._chunk = ''
+                    break
+            end = len(self._chunk) if size < 0 else min(len(self._chunk), self._position + size)
+            parts.append(self._chunk[self._position:end])
+            if size > 0:
+                size -= end - self._position
+            self._position = end
+        return ''.join(parts)
+
+
+class FileRange(io.RawIOBase):
+    """Binary read-only view of the bytes [start, stop) of a file"""
+    
+    def __init__(self, path, start, stop):
+        self._file = open(path, 'rb')
+        self._file.seek(start)
+        self._remaining = stop - start
+    
+    def readable(self):
+        return True
+    
+    def read(self, size=-1):
+        if size < 0 or size > self._remaining:
+            size = self._remaining
+        data = self._file.read(size)
+        self._remaining -= len(data)
+        return data
+    
+    def close(self):
+        self._file.close()
+        super().close()
+
+
+def csv_chunk_ranges(path, chunk_bytes, block_bytes=1024 * 1024):
+    """Split the records of a CSV file (after its header) into byte ranges of about chunk_bytes.
+
+    A newline only ends a record when the quotes before it are balanced, so
+    quoted fields spanning lines (street addresses) are never cut in two.
+    """
+    size = os.path.getsize(path)
+    ranges = []
+    with open(path, 'rb') as f:
+        start = len(f.readline())
+        target = start + chunk_bytes
+        position, quotes = start, 0
+        while target < size:
+            block = f.read(block_bytes)
+            if not block:
+                break
+            index = max(0, target - position)
+            while index < len(block):
+                newline = block.find(b'\n', index)
+                if newline == -1:
+                    break
+                if (quotes + block.count(b'"', 0, newline)) % 2 == 0:
+                    boundary = position + newline + 1
+                    ranges.append((start, boundary))
+                    start, target = boundary, boundary + chunk_bytes
+                    index = max(newline + 1, target - position)
+                else:
+                    index = newline + 1
+            quotes += block.count(b'"')
+            position += len(block)
+    if start < size:
+        ranges.append((start, size))
+    return ranges
+
+
+def parquet_chunk_groups(path, chunk_bytes):
+    """Split the row groups of a Parquet file into runs of about chunk_bytes compressed bytes"""
+    import pyarrow.parquet as pq
+    metadata = pq.ParquetFile(path).metadata
+    groups, current, current_bytes = [], [], 0
+    for index in range(metadata.num_row_groups):
+        row_group = metadata.row_group(index)
+        current.append(index)
+        current_bytes += sum(row_group.column(c).total_compressed_size for c in range(row_group.num_columns))
+        if current_bytes >= chunk_bytes:
+            groups.append(current)
+            current, current_bytes = [], 0
+    if current:
+        groups.append(current)
+    return groups
+
+
+def chunk_bounds(chunk):
+    """(start, stop) of a chunk: a CSV byte range as is, a run of Parquet row groups as its index range"""
+    if isinstance(chunk, list):
+        return chunk[0], chunk[-1] + 1
+    return chunk
+
+
+def load_tiers(dependencies, tables):
+    """Group tables into tiers whose foreign keys only reference tables in earlier tiers"""
+    remaining = {table: set(dependencies.get(table, ())) & set(tables) for table in tables}
+    tiers = []
+    while remaining:
+        ready = [table for table in tables if table in remaining and not remaining[table]]
+        if not ready:
+            raise ValueError(f"Foreign key cycle between tables: {sorted(remaining)}")
+        tiers.append(ready)
+        for table in ready:
+            del remaining[table]
+        for parents in remaining.values():
+            parents.difference_update(ready)
+    return tiers
+
+
+def frame_csv_chunks(frames):
+    """CSV text (no header) of each DataFrame; missing values become empty, unquoted NULL fields"""
+    for frame in frames:
+        yield frame.to_csv(header=False, index=False, lineterminator='\n')
+
+
+class LoadMetrics:
+    """Per-table load measurements: rows, bytes, duration and throughput, written as a JSON report.
+
+    Rows are the exact counts reported by COPY or INSERT, so no table is
+    scanned to report them. ``table_rows`` is the table's size after the load
+    when that is known without a scan (the table was replaced, or verified).
+    """
+    
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.tables = {}
+    
+    def record(self, table_name, mode, rows, bytes_read, started, finished, table_rows=None, verified=None):
+        seconds = finished - started
+        self.tables[table_name] = {
+            'mode': mode,
+            'rows': rows,
+            'bytes': bytes_read,
+            'seconds': round(seconds, 4),
+            'rows_per_sec': round(rows / seconds) if seconds else None,
+            'bytes_per_sec': round(bytes_read / seconds) if seconds else None,
+            'started_at': round(started - self.started, 4),
+            'finished_at': round(finished - self.started, 4),
+            'table_rows': table_rows,
+            'verified': verified
+        }
+    
+    def record_failure(self, table_name, mode, error):
+        self.tables[table_name] = {'mode': mode, 'error': str(error).strip()}
+    
+    def loaded_rows(self, tables=None):
+        """Rows loaded into the given tables (default all), failed tables counting zero"""
+        return sum(metrics.get('rows', 0) for table, metrics in self.tables.items()
+                   if tables is None or table in tables)
+    
+    def write_report(self, path, estimates):
+        """Write the measurements, run totals and the row estimates of every table as JSON"""
+        loaded = [metrics for metrics in self.tables.values() if 'rows' in metrics]
+        wall = time.perf_counter() - self.started
+        report = {
+            'generated_at': datetime.now().isoformat(),
+            'tables': self.tables,
+            'totals': {
+                'tables_loaded': len(loaded),
+                'tables_failed': len(self.tables) - len(loaded),
+                'rows': sum(metrics['rows'] for metrics in loaded),
+                'bytes': sum(metrics['bytes'] for metrics in loaded),
+                'wall_seconds': round(wall, 4),
+                'rows_per_sec': round(sum(metrics['rows'] for metrics in loaded) / wall) if wall else None
+            },
+            'row_estimates': estimates
+        }
+        with open(path, 'w') as f:
+            json.dump(report, f, indent=2)
+        return report
+
+
 class WakefitDataUploader:
-    def __init__(self, csv_folder, db_config):
+    def __init__(self, csv_folder, db_config, data_format=DATA_FORMAT, load_method=LOAD_METHOD,
+                 workers=UPLOAD_WORKERS, chunk_workers=COPY_CHUNK_WORKERS, max_connections=UPLOAD_MAX_CONNECTIONS,
+                 bulk_load=BULK_LOAD, shadow_load=SHADOW_LOAD, delta_load=DELTA_LOAD, force_reload=FORCE_RELOAD,
+                 resume=False, verify=VERIFY_COUNTS):
+        if data_format not in ('auto', 'csv', 'parquet'):
+            raise ValueError(f"Unknown data format '{data_format}', expected auto, csv or parquet")
+        if load_method not in ('copy', 'insert'):
+            raise ValueError(f"Unknown load method '{load_method}', expected copy or insert")
+        if bulk_load + shadow_load + delta_load > 1:
+            raise ValueError("Bulk-load, shadow-load and delta modes cannot be combined")
         self.csv_folder = Path(csv_folder)
         self.db_config = db_config
+        self.data_format = data_format
+        self.load_method = load_method
+        # One connection budget covers the table workers and the chunk pools they open
+        self.max_connections = max(1, max_connections)
+        self.workers = min(max(1, workers), self.max_connections)
+        self.chunk_workers = min(max(1, chunk_workers),
+                                 max(1, (self.max_connections - self.workers) // self.workers))
+        self.bulk_load = bulk_load
+        self.shadow_load = shadow_load
+        self.delta_load = delta_load
+        self.delta_counts = {}
+        self.force_reload = force_reload
+        self.resume = resume
+        self.journaling = False
+        self.verify = verify
+        self._swap_lock = threading.Lock()
         self.conn = None
         
+        # Foreign key parents of each table, from the schema in create_wakefit_database.py
+        self.dependencies = {table: table_dependencies().get(table, set()) & set(TABLES) for table in TABLES}
+        self.metrics = LoadMetrics()
+        
+        # Per-table entries of the generator's manifest.json, if the data folder has one
+        manifest_path = self.csv_folder / 'manifest.json'
+        self.manifest = {}
+        if manifest_path.exists():
+            with open(manifest_path) as f:
+                self.manifest = json.load(f)['tables']
+        
     def connect_db(self):
         """Establish database connection"""
         try:
@@ -70,10 +360,10 @@ class WakefitDataUploader:
         if self.conn:
             self.conn.close()
     
-    def table_exists(self, table_name):
+    def table_exists(self, table_name, conn=None, log=print):
         """Check if table exists in database"""
         try:
-            cursor = self.conn.cursor()
+            cursor = (conn or self.conn).cursor()
             cursor.execute("""
                 SELECT EXISTS (
                     SELECT 1 FROM information_schema.tables 
@@ -84,106 +374,1038 @@ class WakefitDataUploader:
             cursor.close()
             return exists
         except Exception as e:
-            print(f"Error checking table existence: {e}")
+            log(f"Error checking table existence: {e}")
             return False
     
-    def upload_table(self, table_name):
-        """Upload single table to database"""
-        csv_file = self.csv_folder / f"{table_name}.csv"
+    def data_file(self, table_name):
+        """Path of the file holding a table, following the configured data format"""
+        formats = ['parquet', 'csv'] if self.data_format == 'auto' else [self.data_format]
+        for extension in formats:
+            path = self.csv_folder / f"{table_name}.{extension}"
+            if path.exists():
+                return path
+        return self.csv_folder / f"{table_name}.{formats[-1]}"
+    
+    def read_data_file(self, path):
+        """Read a table file; Parquet keeps typed dates, timestamps and times, so nothing is re-parsed"""
+        if path.suffix == '.parquet':
+            return pd.read_parquet(path)
+        return pd.read_csv(path)
+    
+    def read_data_frames(self, path, chunk_rows=COPY_CHUNK_ROWS, row_groups=None):
+        """Yield a table file (optionally only some Parquet row groups) as DataFrames of at most chunk_rows rows"""
+        if path.suffix == '.parquet':
+            import pyarrow.parquet as pq
+            for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_rows, row_groups=row_groups):
+                yield batch.to_pandas()
+        else:
+            yield from pd.read_csv(path, chunksize=chunk_rows)
+    
+    def copy_csv_file(self, cursor, table_name, path):
+        """Stream a CSV file with a header row straight into a table; empty fields load as NULL"""
+        with open(path, newline='', encoding='utf-8') as f:
+            columns = next(csv.reader(f))
+            f.seek(0)
+            cursor.copy_expert(
+                f"COPY {table_name} ({','.join(columns)}) FROM STDIN WITH (FORMAT csv, HEADER true)",
+                f, size=1024 * 1024
+            )
+        return cursor.rowcount
+    
+    def copy_frames(self, cursor, table_name, columns, frames):
+        """Stream DataFrames (from a file or straight from a generator) into a table through one COPY"""
+        cursor.copy_expert(
+            f"COPY {table_name} ({','.join(columns)}) FROM STDIN WITH (FORMAT csv)",
+            CopyStream(frame_csv_chunks(frames)), size=1024 * 1024
+        )
+        return cursor.rowcount
+    
+    def copy_data_file(self, cursor, table_name, data_file):
+        """Bulk load a table file with COPY FROM STDIN"""
+        if data_file.suffix == '.csv':
+            return self.copy_csv_file(cursor, table_name, data_file)
+        import pyarrow.parquet as pq
+        columns = pq.ParquetFile(data_file).schema_arrow.names
+        return self.copy_frames(cursor, table_name, columns, self.read_data_frames(data_file))
+    
+    def file_columns(self, data_file):
+        """Column names of a table file, in file order"""
+        if data_file.suffix == '.csv':
+            with open(data_file, newline='', encoding='utf-8') as f:
+                return next(csv.reader(f))
+        import pyarrow.parquet as pq
+        return pq.ParquetFile(data_file).schema_arrow.names
+    
+    def is_chunked(self, data_file):
+        """Whether a file is large enough to be COPYed in parallel chunks"""
+        return (self.load_method == 'copy' and self.chunk_workers > 1
+                and data_file.stat().st_size > COPY_CHUNK_MB * 1024 * 1024)
+    
+    def copy_chunk(self, pool, staging, columns, data_file, chunk, number, log=print, journal=None):
+        """COPY one chunk into the staging table in its own transaction, retrying transient failures.
+
+        With ``journal`` (the table being loaded) the chunk is recorded in the
+        chunk journal in the same transaction, and a retry first checks the
+        journal, since a commit whose connection dropped may still have landed.
+        """
+        for attempt in range(1, COPY_CHUNK_RETRIES + 1):
+            conn = pool.getconn()
+            try:
+                cursor = conn.cursor()
+                if journal and attempt > 1:
+                    cursor.execute(f"SELECT row_count FROM {CHUNK_JOURNAL_TABLE} "
+                                   f"WHERE table_name = %s AND chunk_number = %s", (journal, number))
+                    committed = cursor.fetchone()
+                    conn.commit()
+                    if committed:
+                        pool.putconn(conn)
+                        return committed[0]
+                if data_file.suffix == '.csv':
+                    with FileRange(data_file, *chunk) as f:
+                        cursor.copy_expert(f"COPY {staging} ({','.join(columns)}) FROM STDIN WITH (FORMAT csv)",
+                                           f, size=1024 * 1024)
+                    rows = cursor.rowcount
+                else:
+                    rows = self.copy_frames(cursor, staging, columns, self.read_data_frames(data_file, row_groups=chunk))
+                if journal:
+                    cursor.execute(f"""
+                        INSERT INTO {CHUNK_JOURNAL_TABLE}
+                            (table_name, chunk_number, chunk_start, chunk_stop, file_size, row_count, committed_at)
+                        VALUES (%s, %s, %s, %s, %s, %s, CURRENT_TIMESTAMP)
+                    """, (journal, number, *chunk_bounds(chunk), data_file.stat().st_size, rows))
+                conn.commit()
+                pool.putconn(conn)
+                return rows
+            except (psycopg2.OperationalError, psycopg2.extensions.TransactionRollbackError) as e:
+                pool.putconn(conn, close=True)
+                if attempt == COPY_CHUNK_RETRIES:
+                    raise
+                log(f"  Chunk {number} failed (attempt {attempt}/{COPY_CHUNK_RETRIES}): {e}".rstrip())
+                time.sleep(0.5 * 2 ** (attempt - 1))
+            except Exception:
+                pool.putconn(conn, close=True)
+                raise
+    
+    def execute_separately(self, *statements):
+        """Run statements on a short-lived connection of their own and commit them"""
+        conn = psycopg2.connect(**self.db_config)
+        try:
+            with conn.cursor() as cursor:
+                for statement in statements:
+                    cursor.execute(statement)
+            conn.commit()
+        finally:
+            conn.close()
+    
+    def chunk_plan(self, data_file):
+        """Chunks a file is COPYed in: byte ranges of a CSV file, runs of row groups of a Parquet file"""
+        chunk_bytes = int(COPY_CHUNK_MB * 1024 * 1024)
+        if data_file.suffix == '.csv':
+            return csv_chunk_ranges(data_file, chunk_bytes)
+        return parquet_chunk_groups(data_file, chunk_bytes)
+    
+    def copy_chunks_parallel(self, target, data_file, log=print, journal=None, done=None):
+        """COPY a file into a committed table in parallel chunks, each over its own pooled connection.
+
+        Chunks in ``done`` (number -> rows, already committed to target) are
+        skipped; ``journal`` is passed on to copy_chunk.
+        """
+        columns = self.file_columns(data_file)
+        done = done or {}
+        chunks = [(number, chunk) for number, chunk in enumerate(self.chunk_plan(data_file), 1) if number not in done]
+        if done:
+            log(f"  Resuming after {len(done)} committed chunks ({sum(done.values()):,} rows)")
+        if not chunks:
+            return sum(done.values())
+        workers = min(self.chunk_workers, len(chunks))
+        log(f"  Copying {len(chunks)} chunks over {workers} connections into {target}")
+        
+        pool = ThreadedConnectionPool(1, workers, **self.db_config)
+        try:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                return sum(done.values()) + sum(executor.map(
+                    lambda numbered: self.copy_chunk(pool, target, columns, data_file, numbered[1], numbered[0],
+                                                     log, journal),
+                    chunks
+                ))
+        finally:
+            pool.closeall()
+    
+    def committed_chunks(self, conn, table_name, staging, data_file):
+        """Chunks of an interrupted chunked load that a resumed run can keep, as number -> rows.
+
+        They are only kept when the journal's offsets and file size match the
+        current chunk plan and the staging table still holds exactly the
+        journaled rows (an UNLOGGED table is emptied by a server crash).
+        """
+        cursor = conn.cursor()
+        cursor.execute(f"""
+            SELECT chunk_number, chunk_start, chunk_stop, file_size, row_count
+            FROM {CHUNK_JOURNAL_TABLE} WHERE table_name = %s
+        """, (table_name,))
+        journaled = cursor.fetchall()
+        cursor.execute("SELECT to_regclass(%s) IS NOT NULL", (staging,))
+        staged = cursor.fetchone()[0]
+        if staged and journaled:
+            cursor.execute(f"SELECT COUNT(*) FROM {staging}")
+            staged = cursor.fetchone()[0] == sum(row[4] for row in journaled)
+        conn.commit()
+        cursor.close()
+        
+        plan = {number: chunk_bounds(chunk) for number, chunk in enumerate(self.chunk_plan(data_file), 1)}
+        size = data_file.stat().st_size
+        if not staged or any(plan.get(number) != (start, stop) or file_size != size
+                             for number, start, stop, file_size, _ in journaled):
+            return {}
+        return {number: rows for number, _, _, _, rows in journaled}
+    
+    def copy_data_file_chunked(self, cursor, table_name, data_file, truncate=True, log=print):
+        """COPY a large file in parallel chunks into a staging table, then merge it on cursor.
+
+        Chunks load into an UNLOGGED copy of the table, each over its own pooled
+        connection and committed on its own, so a failed chunk is simply retried.
+        The table itself is only touched at the end: TRUNCATE (when asked),
+        INSERT ... SELECT from staging and DROP of staging run in the caller's
+        transaction, whose commit is the single point where the new rows appear.
+        """
+        column_list = ','.join(self.file_columns(data_file))
+        staging = f"{table_name}__chunks"
+        journal = table_name if self.journaling else None
+        done = self.committed_chunks(cursor.connection, table_name, staging, data_file) if journal and self.resume else {}
+        if not done:
+            self.execute_separately(f"DROP TABLE IF EXISTS {staging}",
+                                    f"CREATE UNLOGGED TABLE {staging} (LIKE {table_name} INCLUDING DEFAULTS)",
+                                    *([f"DELETE FROM {CHUNK_JOURNAL_TABLE} WHERE table_name = '{table_name}'"]
+                                      if journal else []))
+        try:
+            rows = self.copy_chunks_parallel(staging, data_file, log, journal, done)
+            if truncate:
+                cursor.execute(f"TRUNCATE TABLE {table_name} CASCADE")
+                log(f"  Cleared existing data from {table_name}")
+            cursor.execute(f"INSERT INTO {table_name} ({column_list}) SELECT {column_list} FROM {staging}")
+            cursor.execute(f"DROP TABLE {staging}")
+            if journal:
+                cursor.execute(f"DELETE FROM {CHUNK_JOURNAL_TABLE} WHERE table_name = %s", (table_name,))
+            return rows
+        except Exception:
+            # Release the caller's locks on staging before dropping it from another connection
+            cursor.connection.rollback()
+            if journal:
+                log(f"  Kept {staging} and its committed chunks for --resume")
+            else:
+                self.execute_separately(f"DROP TABLE IF EXISTS {staging}")
+            raise
+    
+    def insert_data_file(self, cursor, table_name, data_file):
+        """Load a table file with batched INSERT statements"""
+        # Read data file
+        df = self.read_data_file(data_file)
+        
+        # Insert data if not empty
+        if not df.empty:
+            # Convert DataFrame to list of tuples
+            columns = df.columns.tolist()
+            values = []
+            
+            for _, row in df.iterrows():
+                # Convert NaN to None for proper NULL handling
+                row_values = []
+                for val in row:
+                    if pd.isna(val):
+                        row_values.append(None)
+                    else:
+                        row_values.append(val)
+                values.append(tuple(row_values))
+            
+            # Create insert query with proper column names
+            placeholders = ','.join(['%s'] * len(columns))
+            insert_query = f"""
+            INSERT INTO {table_name} ({','.join(columns)}) 
+            VALUES ({placeholders})
+            """
+            
+            # Insert in batches for better performance
+            batch_size = int(os.environ.get('BATCH_SIZE', 1000))
+            for i in range(0, len(values), batch_size):
+                batch = values[i:i + batch_size]
+                cursor.executemany(insert_query, batch)
+        
+        return len(df)
+    
+    def upload_table(self, table_name, conn=None, truncate=True, log=print):
+        """Upload single table to database (over conn, default the uploader's own connection)"""
+        conn = conn or self.conn
+        data_file = self.data_file(table_name)
         
-        if not csv_file.exists():
-            print(f"  CSV file not found: {csv_file}")
+        if not data_file.exists():
+            log(f"  Data file not found: {data_file}")
             return False
         
-        if not self.table_exists(table_name):
-            print(f"  Table '{table_name}' does not exist in database")
+        if not self.table_exists(table_name, conn, log):
+            log(f"  Table '{table_name}' does not exist in database")
             return False
         
+        mode = self.load_mode(data_file)
+        started = time.perf_counter()
         try:
-            # Read CSV file
-            df = pd.read_csv(csv_file)
-            row_count = len(df)
+            log(f"  {data_file.suffix[1:].upper()} file found ({data_file.stat().st_size / (1024 * 1024):,.1f} MB)")
             
-            print(f"  CSV file found with {row_count:,} rows")
-            
-            # Clear existing data
-            cursor = self.conn.cursor()
-            cursor.execute(f"TRUNCATE TABLE {table_name} CASCADE")
-            print(f"  Cleared existing data from {table_name}")
-            
-            # Insert data if not empty
-            if not df.empty:
-                # Convert DataFrame to list of tuples
-                columns = df.columns.tolist()
-                values = []
-                
-                for _, row in df.iterrows():
-                    # Convert NaN to None for proper NULL handling
-                    row_values = []
-                    for val in row:
-                        if pd.isna(val):
-                            row_values.append(None)
-                        else:
-                            row_values.append(val)
-                    values.append(tuple(row_values))
-                
-                # Create insert query with proper column names
-                placeholders = ','.join(['%s'] * len(columns))
-                insert_query = f"""
-                INSERT INTO {table_name} ({','.join(columns)}) 
-                VALUES ({placeholders})
-                """
-                
-                # Insert in batches for better performance
-                batch_size = int(os.environ.get('BATCH_SIZE', 1000))
-                for i in range(0, len(values), batch_size):
-                    batch = values[i:i + batch_size]
-                    cursor.executemany(insert_query, batch)
+            cursor = conn.cursor()
+            if self.delta_load:
+                # Upserts in this transaction; rows not in the file are left alone
+                inserted, updated, unchanged = self.delta_load_table(conn, table_name, data_file)
+                self.delta_counts[table_name] = (inserted, updated, unchanged)
+                row_count = inserted + updated + unchanged
+                log(f"  Upserted: {inserted:,} inserted, {updated:,} updated, {unchanged:,} unchanged")
+            elif self.shadow_load:
+                # Loads, indexes and swaps in its own transactions; the live table is never emptied
+                row_count = self.shadow_load_table(conn, table_name, data_file, log)
+                log(f"  Loaded {row_count:,} rows through {table_name}__staging")
+            elif self.is_chunked(data_file):
+                # Chunks load into staging first; the TRUNCATE and the merge share this transaction
+                row_count = self.copy_data_file_chunked(cursor, table_name, data_file, truncate, log)
+                log(f"  Copied {row_count:,} rows with parallel COPY FROM STDIN")
+            else:
+                # Clear existing data
+                if truncate:
+                    cursor.execute(f"TRUNCATE TABLE {table_name} CASCADE")
+                    log(f"  Cleared existing data from {table_name}")
                 
-                print(f"  Uploading data in batches of {batch_size}...")
+                # Load the file in the same transaction as the TRUNCATE
+                if self.load_method == 'copy':
+                    row_count = self.copy_data_file(cursor, table_name, data_file)
+                    log(f"  Copied {row_count:,} rows with COPY FROM STDIN")
+                else:
+                    row_count = self.insert_data_file(cursor, table_name, data_file)
+                    log(f"  Inserted {row_count:,} rows in batches of {int(os.environ.get('BATCH_SIZE', 1000))}")
             
-            # Commit transaction
-            self.conn.commit()
+            # Commit transaction, with the manifest entry of the file just loaded and its journal entry
+            self.record_manifest(cursor, table_name)
+            if self.journaling:
+                cursor.execute(f"""
+                    INSERT INTO {JOURNAL_TABLE} (table_name, completed_at) VALUES (%s, CURRENT_TIMESTAMP)
+                    ON CONFLICT (table_name) DO UPDATE SET completed_at = EXCLUDED.completed_at
+                """, (table_name,))
+            conn.commit()
             cursor.close()
+            finished = time.perf_counter()
             
-            # Verify upload
-            cursor = self.conn.cursor()
-            cursor.execute(f"SELECT COUNT(*) FROM {table_name}")
-            db_count = cursor.fetchone()[0]
-            cursor.close()
+            # Every mode but delta replaces the table, so it now holds exactly the rows loaded
+            table_rows = None if self.delta_load else row_count
+            verified = None
+            if self.verify:
+                cursor = conn.cursor()
+                cursor.execute(f"SELECT COUNT(*) FROM {table_name}")
+                db_count = cursor.fetchone()[0]
+                conn.commit()
+                cursor.close()
+                verified = table_rows is None or db_count == table_rows
+                table_rows = db_count
+                if not verified:
+                    log(f"  Verification failed: {table_name} holds {db_count:,} rows, {row_count:,} were loaded")
+            self.metrics.record(table_name, mode, row_count, data_file.stat().st_size, started, finished,
+                                table_rows, verified)
             
-            print(f"  Successfully uploaded {db_count:,} rows to {table_name}")
-            return True
+            log(f"  Successfully uploaded {row_count:,} rows to {table_name} "
+                f"in {finished - started:.2f}s{' (verified)' if verified else ''}")
+            return verified is not False
             
         except Exception as e:
-            print(f"  Error uploading {table_name}: {e}")
-            if self.conn:
-                self.conn.rollback()
+            log(f"  Error uploading {table_name}: {e}")
+            self.metrics.record_failure(table_name, mode, e)
+            if conn:
+                conn.rollback()
             return False
     
+    def load_mode(self, data_file):
+        """Name of the path a file is loaded by, as recorded in the metrics"""
+        if self.delta_load:
+            return 'delta'
+        if self.shadow_load:
+            return 'shadow'
+        if self.is_chunked(data_file):
+            return 'chunked-copy'
+        return self.load_method
+    
+    def truncate_tables(self, tables):
+        """Empty several tables in one statement, so concurrent loads never truncate each other's children"""
+        cursor = self.conn.cursor()
+        cursor.execute(f"TRUNCATE TABLE {', '.join(tables)} CASCADE")
+        self.conn.commit()
+        cursor.close()
+    
+    def _upload_pooled(self, pool, table_name):
+        """Load one table over a pooled connection; returns (success, seconds, log lines)"""
+        lines = []
+        started = time.perf_counter()
+        conn = pool.getconn()
+        try:
+            success = self.upload_table(table_name, conn=conn, truncate=False, log=lines.append)
+        finally:
+            pool.putconn(conn)
+        return success, time.perf_counter() - started, lines
+    
+    def upload_all_tables_parallel(self, dependencies=None, tables=TABLES):
+        """Upload tables concurrently, each starting as soon as every table it references is loaded.
+
+        The foreign key graph comes from the schema in create_wakefit_database.py
+        unless ``dependencies`` overrides it; parents outside ``tables`` are taken
+        as loaded. The tables are truncated up front in one transaction, then
+        loaded over a bounded pool of ``workers`` connections; a table whose
+        parent failed is skipped.
+        """
+        dependencies = self.dependencies if dependencies is None else dependencies
+        tiers = load_tiers(dependencies, tables)
+        print(f"Starting upload of {len(tables)} tables with {self.workers} workers...")
+        for level, tier in enumerate(tiers, 1):
+            print(f"  Tier {level}: {', '.join(tier)}")
+        print("=" * 60)
+        
+        if self.shadow_load:
+            print("Shadow load: each table stays readable until its staging copy is swapped in")
+        elif self.delta_load:
+            print("Delta load: new and changed rows are upserted, existing rows are kept")
+        else:
+            self.truncate_tables(tables)
+            print(f"Cleared existing data from {len(tables)} tables")
+        
+        loaded, failed_tables, timings = [], [], {}
+        started = time.perf_counter()
+        pool = ThreadedConnectionPool(1, self.workers, **self.db_config)
+        try:
+            with ThreadPoolExecutor(max_workers=self.workers) as executor:
+                pending = {}
+                waiting = list(tables)
+                while waiting or pending:
+                    for table in list(waiting):
+                        parents = set(dependencies.get(table, ())) & set(tables)
+                        if parents & set(failed_tables):
+                            waiting.remove(table)
+                            failed_tables.append(table)
+                            print(f"Skipped {table}: a referenced table failed to load\n")
+                        elif parents <= set(loaded):
+                            waiting.remove(table)
+                            pending[executor.submit(self._upload_pooled, pool, table)] = table
+                    
+                    if not pending:
+                        continue
+                    finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        table = pending.pop(future)
+                        success, seconds, lines = future.result()
+                        timings[table] = seconds
+                        (loaded if success else failed_tables).append(table)
+                        print(f"[{len(loaded) + len(failed_tables)}/{len(tables)}] {table} "
+                              f"({'done' if success else 'FAILED'} in {seconds:.2f}s)")
+                        for line in lines:
+                            print(line)
+                        print()
+        finally:
+            pool.closeall()
+        elapsed = time.perf_counter() - started
+        
+        # Summary
+        total_rows = self.metrics.loaded_rows(loaded)
+        slowest = max(timings, key=timings.get) if timings else None
+        print("=" * 60)
+        print("Upload Summary:")
+        print(f"  Successful: {len(loaded)} tables")
+        print(f"  Failed: {len(failed_tables)} tables")
+        print(f"  Total rows uploaded: {total_rows:,}")
+        print(f"  Wall time: {elapsed:.2f}s (sum of table times {sum(timings.values()):.2f}s)")
+        if slowest:
+            print(f"  Slowest table: {slowest} ({timings[slowest]:.2f}s)")
+        
+        if failed_tables:
+            print(f"  Failed tables: {', '.join(failed_tables)}")
+        
+        return len(loaded), failed_tables
+    
+    def capture_load_definitions(self, tables=TABLES, conn=None):
+        """Keys and secondary indexes of the tables, and foreign keys from or to them, as SQL to recreate them"""
+        conn = conn or self.conn
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT con.conname, cl.relname, con.contype, pg_get_constraintdef(con.oid), ref.relname,
+                   ARRAY(SELECT a.attname::text FROM unnest(con.conkey) WITH ORDINALITY AS k(attnum, i)
+                         JOIN pg_attribute a ON a.attrelid = con.conrelid AND a.attnum = k.attnum ORDER BY k.i),
+                   ARRAY(SELECT a.attname::text FROM unnest(con.confkey) WITH ORDINALITY AS k(attnum, i)
+                         JOIN pg_attribute a ON a.attrelid = con.confrelid AND a.attnum = k.attnum ORDER BY k.i)
+            FROM pg_constraint con
+            JOIN pg_class cl ON cl.oid = con.conrelid
+            JOIN pg_namespace ns ON ns.oid = cl.relnamespace
+            LEFT JOIN pg_class ref ON ref.oid = con.confrelid
+            WHERE ns.nspname = current_schema()
+              AND ((con.contype IN ('p', 'u') AND cl.relname = ANY(%s))
+                   OR (con.contype = 'f' AND (cl.relname = ANY(%s) OR ref.relname = ANY(%s))))
+            ORDER BY con.contype DESC, cl.relname, con.conname
+        """, (list(tables), list(tables), list(tables)))
+        keys, foreign_keys = [], []
+        for name, table, kind, definition, referenced, columns, referenced_columns in cursor.fetchall():
+            if kind == 'f':
+                # A constraint left NOT VALID by an earlier load is recreated like any other
+                foreign_keys.append({'name': name, 'table': table, 'definition': definition.removesuffix(' NOT VALID'),
+                                     'columns': columns, 'referenced_table': referenced,
+                                     'referenced_columns': referenced_columns})
+            else:
+                keys.append({'name': name, 'table': table, 'definition': definition})
+        
+        cursor.execute("""
+            SELECT ix.relname, tb.relname, pg_get_indexdef(ix.oid)
+            FROM pg_index i
+            JOIN pg_class ix ON ix.oid = i.indexrelid
+            JOIN pg_class tb ON tb.oid = i.indrelid
+            JOIN pg_namespace ns ON ns.oid = tb.relnamespace
+            WHERE ns.nspname = current_schema() AND tb.relname = ANY(%s)
+              AND NOT EXISTS (SELECT 1 FROM pg_constraint con WHERE con.conindid = i.indexrelid
+                              AND con.conrelid = i.indrelid AND con.contype IN ('p', 'u', 'x'))
+            ORDER BY tb.relname, ix.relname
+        """, (list(tables),))
+        indexes = [{'name': name, 'table': table, 'definition': definition}
+                   for name, table, definition in cursor.fetchall()]
+        cursor.close()
+        conn.commit()
+        return {'keys': keys, 'indexes': indexes, 'foreign_keys': foreign_keys}
+    
+    def run_statements(self, statements, label, log=print):
+        """Run independent DDL statements in parallel, each in its own transaction on a pooled connection.
+
+        Returns {statement: (seconds, error or None)}; failures are reported, not raised.
+        """
+        if not statements:
+            return {}
+        
+        def run(pool, statement):
+            started = time.perf_counter()
+            conn = pool.getconn()
+            try:
+                with conn.cursor() as cursor:
+                    cursor.execute(statement)
+                conn.commit()
+                error = None
+            except psycopg2.Error as e:
+                conn.rollback()
+                error = str(e).strip()
+            finally:
+                pool.putconn(conn)
+            return time.perf_counter() - started, error
+        
+        workers = min(self.workers, len(statements))
+        started = time.perf_counter()
+        pool = ThreadedConnectionPool(1, workers, **self.db_config)
+        try:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                results = dict(zip(statements, executor.map(lambda statement: run(pool, statement), statements)))
+        finally:
+            pool.closeall()
+        
+        failures = sum(1 for _, error in results.values() if error)
+        log(f"  {label}: {len(statements)} statements over {workers} connections "
+              f"in {time.perf_counter() - started:.2f}s" + (f", {failures} FAILED" if failures else ""))
+        for statement, (_, error) in results.items():
+            if error:
+                log(f"    {statement}\n      {error}")
+        return results
+    
+    def set_tables_logged(self, logged, tables=TABLES):
+        """Switch tables between LOGGED and UNLOGGED (no foreign keys may link them meanwhile)"""
+        mode = 'LOGGED' if logged else 'UNLOGGED'
+        return self.run_statements([f"ALTER TABLE {table} SET {mode}" for table in tables], f"SET {mode}")
+    
+    def drop_load_definitions(self, definitions):
+        """Drop foreign keys, then secondary indexes, then primary and unique keys"""
+        cursor = self.conn.cursor()
+        for foreign_key in definitions['foreign_keys']:
+            cursor.execute(f"ALTER TABLE {foreign_key['table']} DROP CONSTRAINT IF EXISTS {foreign_key['name']}")
+        for index in definitions['indexes']:
+            cursor.execute(f"DROP INDEX IF EXISTS {index['name']}")
+        for key in definitions['keys']:
+            cursor.execute(f"ALTER TABLE {key['table']} DROP CONSTRAINT IF EXISTS {key['name']}")
+        self.conn.commit()
+        cursor.close()
+        print(f"  Dropped {len(definitions['foreign_keys'])} foreign keys, {len(definitions['indexes'])} indexes "
+              f"and {len(definitions['keys'])} primary/unique keys")
+    
+    def restore_load_definitions(self, definitions):
+        """Rebuild keys and indexes in parallel, then re-add foreign keys NOT VALID and validate them in parallel.
+
+        Returns {statement: (seconds, error or None)} for every statement run.
+        """
+        results = self.run_statements(
+            [f"ALTER TABLE {key['table']} ADD CONSTRAINT {key['name']} {key['definition']}" for key in definitions['keys']]
+            + [index['definition'] for index in definitions['indexes']],
+            "Rebuild keys and indexes"
+        )
+        
+        # Adding a NOT VALID constraint is a catalog change; the scans happen in VALIDATE, which
+        # only takes SHARE UPDATE EXCLUSIVE locks and so runs concurrently across tables
+        cursor = self.conn.cursor()
+        validations = []
+        for foreign_key in definitions['foreign_keys']:
+            validate = f"ALTER TABLE {foreign_key['table']} VALIDATE CONSTRAINT {foreign_key['name']}"
+            try:
+                cursor.execute(f"ALTER TABLE {foreign_key['table']} ADD CONSTRAINT {foreign_key['name']} "
+                               f"{foreign_key['definition']} NOT VALID")
+                self.conn.commit()
+                validations.append(validate)
+            except psycopg2.Error as e:
+                self.conn.rollback()
+                results[validate] = (0.0, str(e).strip())
+                print(f"  Could not re-add {foreign_key['name']}: {str(e).strip()}")
+        cursor.close()
+        results.update(self.run_statements(validations, "Validate foreign keys"))
+        return results
+    
+    def referential_integrity_report(self, definitions, restored, report_path):
+        """Per foreign key: validated or not, and the orphan rows behind a failed validation"""
+        cursor = self.conn.cursor()
+        report = []
+        for foreign_key in definitions['foreign_keys']:
+            statement = f"ALTER TABLE {foreign_key['table']} VALIDATE CONSTRAINT {foreign_key['name']}"
+            seconds, error = restored.get(statement, (0.0, 'not validated'))
+            orphans = 0
+            if error:
+                child, parent = foreign_key['columns'], foreign_key['referenced_columns']
+                cursor.execute(
+                    f"SELECT COUNT(*) FROM {foreign_key['table']} c WHERE "
+                    + " AND ".join(f"c.{column} IS NOT NULL" for column in child)
+                    + f" AND NOT EXISTS (SELECT 1 FROM {foreign_key['referenced_table']} p WHERE "
+                    + " AND ".join(f"p.{p} = c.{c}" for c, p in zip(child, parent)) + ")"
+                )
+                orphans = cursor.fetchone()[0]
+            report.append({
+                'constraint': foreign_key['name'],
+                'table': foreign_key['table'],
+                'columns': foreign_key['columns'],
+                'referenced_table': foreign_key['referenced_table'],
+                'referenced_columns': foreign_key['referenced_columns'],
+                'validated': error is None,
+                'orphan_rows': orphans,
+                'validation_seconds': round(seconds, 3),
+                'error': error
+            })
+        cursor.close()
+        self.conn.commit()
+        
+        with open(report_path, 'w') as f:
+            json.dump({'generated_at': datetime.now().isoformat(), 'foreign_keys': report}, f, indent=2)
+        
+        print("\nReferential integrity report:")
+        print("-" * 60)
+        for entry in report:
+            status = 'OK' if entry['validated'] else f"NOT VALID ({entry['orphan_rows']:,} orphan rows)"
+            source = f"{entry['table']}.{','.join(entry['columns'])}"
+            print(f"  {source:<45} -> {entry['referenced_table']:<12} {status}")
+        print(f"  Report saved to {report_path}")
+        return report
+    
+    def bulk_upload_all_tables(self, tables=TABLES):
+        """Reload of ``tables`` with their keys, indexes and foreign keys deferred until all data is in.
+
+        Definitions are captured from the catalog and saved next to the data
+        before anything is dropped, so an interrupted run restores them on the
+        next bulk load. Tables are loaded UNLOGGED and, with no foreign keys in
+        place, all at once; they are then set LOGGED (a plain table rewrite,
+        cheapest before any index exists), keys and indexes are rebuilt in
+        parallel, and foreign keys are re-added NOT VALID and validated in
+        parallel, ending with a referential-integrity report.
+        """
+        state_path = self.csv_folder / 'bulk_load_definitions.json'
+        print("Bulk-load mode: deferring keys, indexes and foreign keys")
+        if state_path.exists():
+            with open(state_path) as f:
+                definitions = json.load(f)
+            print(f"  Restoring definitions left by an interrupted bulk load: {state_path}")
+        else:
+            definitions = self.capture_load_definitions(tables)
+            with open(state_path, 'w') as f:
+                json.dump(definitions, f, indent=2)
+        
+        self.drop_load_definitions(definitions)
+        self.set_tables_logged(False, tables)
+        print()
+        try:
+            result = self.load_all_tables(dependencies={}, tables=tables)
+        finally:
+            # End any read transaction left on this connection; it would block the ALTERs below
+            self.conn.commit()
+            print("\nRestoring tables after bulk load...")
+            # Every table, in case an interrupted earlier bulk load left others UNLOGGED (a no-op otherwise)
+            self.set_tables_logged(True)
+            restored = self.restore_load_definitions(definitions)
+            self.referential_integrity_report(definitions, restored,
+                                              self.csv_folder / 'referential_integrity_report.json')
+        
+        # Keep the saved definitions while anything failed to come back, so the next bulk load retries
+        if not any(error for _, error in restored.values()):
+            state_path.unlink()
+        return result
+    
+    def staging_index_definition(self, index, staging):
+        """CREATE INDEX statement rebuilding a live-table index on the staging table under a temporary name"""
+        unique, rest = re.match(r'CREATE (UNIQUE )?INDEX \S+ ON \S+ (.*)$', index['definition']).groups()
+        return f"CREATE {unique or ''}INDEX {index['name']}__staging ON {staging} {rest}"
+    
+    def shadow_load_table(self, conn, table_name, data_file, log=print):
+        """Load a table into <table>__staging and swap it into place by rename.
+
+        The live table stays readable throughout. Staging is loaded, given the
+        table's keys and indexes (built in parallel) and its outgoing foreign keys
+        (validated against the live parents), and analyzed; only then does a short
+        transaction drop the old table, rename staging and its keys and indexes,
+        and re-attach the foreign keys referencing the table NOT VALID. Any
+        failure before the swap leaves the live table untouched.
+        """
+        staging = f"{table_name}__staging"
+        definitions = self.capture_load_definitions([table_name], conn)
+        outgoing = [fk for fk in definitions['foreign_keys'] if fk['table'] == table_name]
+        incoming = [fk for fk in definitions['foreign_keys'] if fk['table'] != table_name]
+        
+        cursor = conn.cursor()
+        cursor.execute(f"DROP TABLE IF EXISTS {staging}")
+        cursor.execute(f"CREATE TABLE {staging} (LIKE {table_name} INCLUDING ALL EXCLUDING INDEXES)")
+        conn.commit()
+        try:
+            if self.is_chunked(data_file):
+                row_count = self.copy_chunks_parallel(staging, data_file, log)
+            elif self.load_method == 'copy':
+                row_count = self.copy_data_file(cursor, staging, data_file)
+            else:
+                row_count = self.insert_data_file(cursor, staging, data_file)
+            conn.commit()
+            
+            built = self.run_statements(
+                [f"ALTER TABLE {staging} ADD CONSTRAINT {key['name']}__staging {key['definition']}"
+                 for key in definitions['keys']]
+                + [self.staging_index_definition(index, staging) for index in definitions['indexes']],
+                "Build staging keys and indexes", log
+            )
+            if any(error for _, error in built.values()):
+                raise RuntimeError(f"keys or indexes could not be built on {staging}")
+            
+            cursor.execute(f"ANALYZE {staging}")
+            conn.commit()
+            
+            # Attaching foreign keys and swapping both lock the parent tables, which sibling tables
+            # loading concurrently share, so these steps run one table at a time to avoid deadlocks
+            with self._swap_lock:
+                # Checked against the live parents here, so the swap itself never scans data
+                for foreign_key in outgoing:
+                    cursor.execute(f"ALTER TABLE {staging} ADD CONSTRAINT {foreign_key['name']} "
+                                   f"{foreign_key['definition']} NOT VALID")
+                    cursor.execute(f"ALTER TABLE {staging} VALIDATE CONSTRAINT {foreign_key['name']}")
+                conn.commit()
+                self.swap_in(conn, table_name, staging, definitions['keys'], definitions['indexes'], incoming, log)
+            return row_count
+        except Exception:
+            conn.rollback()
+            cursor.execute(f"DROP TABLE IF EXISTS {staging}")
+            conn.commit()
+            raise
+    
+    def swap_in(self, conn, table_name, staging, keys, indexes, incoming, log=print):
+        """Replace the live table by staging in one catalog-only transaction, retrying while readers hold it.
+
+        lock_timeout bounds how long the swap queues behind running queries, and
+        so how long new readers can queue behind the swap. The live table's
+        owner and grants are copied onto staging under the same lock, so
+        readers keep their access once it is in place.
+        """
+        cursor = conn.cursor()
+        for attempt in range(1, SWAP_RETRIES + 1):
+            started = time.perf_counter()
+            try:
+                cursor.execute(f"SET LOCAL lock_timeout = {SWAP_LOCK_TIMEOUT_MS}")
+                cursor.execute(f"LOCK TABLE {table_name} IN ACCESS EXCLUSIVE MODE")
+                self.copy_privileges(cursor, table_name, staging)
+                for foreign_key in incoming:
+                    cursor.execute(f"ALTER TABLE {foreign_key['table']} DROP CONSTRAINT {foreign_key['name']}")
+                cursor.execute(f"DROP TABLE {table_name}")
+                cursor.execute(f"ALTER TABLE {staging} RENAME TO {table_name}")
+                for key in keys:
+                    cursor.execute(f"ALTER TABLE {table_name} RENAME CONSTRAINT {key['name']}__staging TO {key['name']}")
+                for index in indexes:
+                    cursor.execute(f"ALTER INDEX {index['name']}__staging RENAME TO {index['name']}")
+                for foreign_key in incoming:
+                    cursor.execute(f"ALTER TABLE {foreign_key['table']} ADD CONSTRAINT {foreign_key['name']} "
+                                   f"{foreign_key['definition']} NOT VALID")
+                conn.commit()
+                log(f"  Swapped {staging} into place in {(time.perf_counter() - started) * 1000:.1f} ms")
+                return
+            except (psycopg2.errors.LockNotAvailable, psycopg2.errors.DeadlockDetected):
+                conn.rollback()
+                if attempt == SWAP_RETRIES:
+                    raise
+                log(f"  Swap of {table_name} could not get its locks (attempt {attempt}/{SWAP_RETRIES}); retrying")
+                time.sleep(0.2 * attempt)
+    
+    def copy_privileges(self, cursor, source, target):
+        """Give target the owner and the exact privileges of source, in the caller's transaction"""
+        cursor.execute("""
+            SELECT quote_ident(pg_get_userbyid(s.relowner)), s.relowner <> t.relowner
+            FROM pg_class s, pg_class t
+            WHERE s.oid = %s::regclass AND t.oid = %s::regclass
+        """, (source, target))
+        owner, owner_differs = cursor.fetchone()
+        if owner_differs:
+            cursor.execute(f"ALTER TABLE {target} OWNER TO {owner}")
+        
+        # A NULL ACL means the owner's default privileges, so both sides are expanded through acldefault
+        privileges = """
+            SELECT CASE WHEN a.grantee = 0 THEN 'PUBLIC' ELSE quote_ident(pg_get_userbyid(a.grantee)) END,
+                   a.privilege_type, a.is_grantable
+            FROM pg_class c, aclexplode(COALESCE(c.relacl, acldefault('r', c.relowner))) a
+            WHERE c.oid = %s::regclass
+        """
+        cursor.execute(privileges, (target,))
+        for grantee in sorted({row[0] for row in cursor.fetchall()}):
+            cursor.execute(f"REVOKE ALL ON {target} FROM {grantee}")
+        cursor.execute(privileges, (source,))
+        for grantee, privilege, grantable in cursor.fetchall():
+            cursor.execute(f"GRANT {privilege} ON {target} TO {grantee}{' WITH GRANT OPTION' if grantable else ''}")
+    
+    def primary_key_columns(self, conn, table_name):
+        """Primary key columns of a table, in key order"""
+        with conn.cursor() as cursor:
+            cursor.execute("""
+                SELECT a.attname
+                FROM pg_index i
+                JOIN pg_attribute a ON a.attrelid = i.indrelid AND a.attnum = ANY(i.indkey)
+                WHERE i.indrelid = %s::regclass AND i.indisprimary
+                ORDER BY array_position(i.indkey::int[], a.attnum::int)
+            """, (table_name,))
+            return [row[0] for row in cursor.fetchall()]
+    
+    def delta_load_table(self, conn, table_name, data_file):
+        """Upsert a table file on its primary key, writing only rows that are new or changed.
+
+        The file is COPYed into a temporary table, each row is compared with the
+        stored row by an md5 of its whole-row text, and only new or changed rows
+        go through INSERT ... ON CONFLICT DO UPDATE; rows missing from the file
+        are kept. Runs in the caller's transaction. Returns (inserted, updated,
+        unchanged).
+        """
+        keys = self.primary_key_columns(conn, table_name)
+        if not keys:
+            raise ValueError(f"{table_name} has no primary key to upsert on")
+        columns = self.file_columns(data_file)
+        delta = f"{table_name}__delta"
+        
+        cursor = conn.cursor()
+        cursor.execute(f"CREATE TEMP TABLE {delta} (LIKE {table_name} INCLUDING DEFAULTS) ON COMMIT DROP")
+        if self.load_method == 'copy':
+            received = self.copy_data_file(cursor, delta, data_file)
+        else:
+            received = self.insert_data_file(cursor, delta, data_file)
+        
+        updates = ', '.join(f"{column} = EXCLUDED.{column}" for column in columns if column not in keys)
+        cursor.execute(f"""
+            WITH upserted AS (
+                INSERT INTO {table_name} ({','.join(columns)})
+                SELECT {','.join(f'd.{column}' for column in columns)}
+                FROM {delta} d
+                LEFT JOIN {table_name} live ON {' AND '.join(f'live.{key} = d.{key}' for key in keys)}
+                WHERE live.{keys[0]} IS NULL OR md5(live::text) <> md5(d::text)
+                ON CONFLICT ({','.join(keys)}) {f'DO UPDATE SET {updates}' if updates else 'DO NOTHING'}
+                RETURNING (xmax = 0) AS inserted
+            )
+            SELECT COUNT(*) FILTER (WHERE inserted), COUNT(*) FILTER (WHERE NOT inserted) FROM upserted
+        """)
+        inserted, updated = cursor.fetchone()
+        cursor.close()
+        return inserted, updated, received - inserted - updated
+    
+    def validate_foreign_keys(self):
+        """Validate, in parallel, every foreign key on the TABLES still marked NOT VALID"""
+        cursor = self.conn.cursor()
+        cursor.execute("""
+            SELECT cl.relname, con.conname
+            FROM pg_constraint con
+            JOIN pg_class cl ON cl.oid = con.conrelid
+            JOIN pg_namespace ns ON ns.oid = cl.relnamespace
+            WHERE ns.nspname = current_schema() AND con.contype = 'f' AND NOT con.convalidated
+              AND cl.relname = ANY(%s)
+            ORDER BY cl.relname, con.conname
+        """, (TABLES,))
+        statements = [f"ALTER TABLE {table} VALIDATE CONSTRAINT {name}" for table, name in cursor.fetchall()]
+        cursor.close()
+        self.conn.commit()
+        return self.run_statements(statements, "Validate foreign keys")
+    
+    def manifest_entry(self, table_name):
+        """The manifest entry of a table if it still describes the data file on disk, else None"""
+        entry = self.manifest.get(table_name)
+        data_file = self.data_file(table_name)
+        if entry is None or not data_file.exists():
+            return None
+        if entry['file'] != data_file.name or entry['size_bytes'] != data_file.stat().st_size:
+            return None
+        return entry
+    
+    def record_manifest(self, cursor, table_name):
+        """Store the manifest entry of a table's file as loaded, in the caller's transaction"""
+        entry = self.manifest_entry(table_name)
+        if entry is None:
+            return
+        cursor.execute(f"""
+            INSERT INTO {MANIFEST_TABLE}
+                (table_name, table_oid, file_name, size_bytes, row_count, sha256, schema_fingerprint, loaded_at)
+            VALUES (%s, %s::regclass::oid, %s, %s, %s, %s, %s, CURRENT_TIMESTAMP)
+            ON CONFLICT (table_name) DO UPDATE SET
+                table_oid = EXCLUDED.table_oid, file_name = EXCLUDED.file_name,
+                size_bytes = EXCLUDED.size_bytes, row_count = EXCLUDED.row_count, sha256 = EXCLUDED.sha256,
+                schema_fingerprint = EXCLUDED.schema_fingerprint, loaded_at = EXCLUDED.loaded_at
+        """, (table_name, table_name, entry['file'], entry['size_bytes'], entry['rows'], entry['sha256'],
+              entry['schema_fingerprint']))
+    
+    def tables_to_load(self):
+        """Tables whose files changed since their last load, plus every table that references them.
+
+        A table is unchanged when the manifest entry stored at its last load
+        matches the data folder's manifest.json and the table is still the one
+        it was loaded into (same OID, so a dropped and recreated table reloads).
+        Unless existing rows are kept (shadow and delta modes), the set is
+        closed over referencing tables, since TRUNCATE ... CASCADE empties them
+        too. The stored entries of the returned tables are deleted, so an
+        interrupted load is retried in full by the next run.
+        """
+        if not self.manifest:
+            return list(TABLES)
+        
+        cursor = self.conn.cursor()
+        cursor.execute(f"""
+            SELECT m.table_name, m.file_name, m.size_bytes, m.row_count, m.sha256, m.schema_fingerprint
+            FROM {MANIFEST_TABLE} m
+            JOIN pg_class c ON c.oid = m.table_oid AND c.relname = m.table_name
+        """)
+        stored = {row[0]: row[1:] for row in cursor.fetchall()}
+        
+        changed = set(TABLES)
+        if not self.force_reload:
+            for table in TABLES:
+                entry = self.manifest_entry(table)
+                if entry and stored.get(table) == (entry['file'], entry['size_bytes'], entry['rows'],
+                                                   entry['sha256'], entry['schema_fingerprint']):
+                    changed.discard(table)
+        if not (self.shadow_load or self.delta_load):
+            referencing = changed
+            while referencing:
+                referencing = {table for table in TABLES if self.dependencies[table] & changed} - changed
+                changed |= referencing
+        
+        tables = [table for table in TABLES if table in changed]
+        cursor.execute(f"DELETE FROM {MANIFEST_TABLE} WHERE table_name = ANY(%s)", (tables,))
+        self.conn.commit()
+        cursor.close()
+        
+        unchanged = [table for table in TABLES if table not in changed]
+        if unchanged:
+            print(f"Unchanged since last load (manifest match), skipped: {', '.join(unchanged)}")
+        return tables
+    
+    def create_control_tables(self):
+        """Create the upload manifest and load journal tables if missing.
+
+        Metrics and table counts read the manifest table, so it has to exist
+        even when the data folder has no manifest.json to compare against.
+        """
+        cursor = self.conn.cursor()
+        cursor.execute(f"""
+            CREATE TABLE IF NOT EXISTS {MANIFEST_TABLE} (
+                table_name VARCHAR(63) PRIMARY KEY,
+                table_oid OID NOT NULL,
+                file_name VARCHAR(255) NOT NULL,
+                size_bytes BIGINT NOT NULL,
+                row_count BIGINT NOT NULL,
+                sha256 CHAR(64) NOT NULL,
+                schema_fingerprint CHAR(64) NOT NULL,
+                loaded_at TIMESTAMP NOT NULL
+            )
+        """)
+        cursor.execute(f"""
+            CREATE TABLE IF NOT EXISTS {JOURNAL_TABLE} (
+                table_name VARCHAR(63) PRIMARY KEY,
+                completed_at TIMESTAMP NOT NULL
+            )
+        """)
+        cursor.execute(f"""
+            CREATE TABLE IF NOT EXISTS {CHUNK_JOURNAL_TABLE} (
+                table_name VARCHAR(63) NOT NULL,
+                chunk_number INTEGER NOT NULL,
+                chunk_start BIGINT NOT NULL,
+                chunk_stop BIGINT NOT NULL,
+                file_size BIGINT NOT NULL,
+                row_count BIGINT NOT NULL,
+                committed_at TIMESTAMP NOT NULL,
+                PRIMARY KEY (table_name, chunk_number)
+            )
+        """)
+        self.conn.commit()
+        cursor.close()
+    
+    def open_journal(self):
+        """Create the control tables and return the tables an interrupted run already completed.
+
+        A resumed run keeps the journal and the chunk staging tables it refers
+        to; any other run starts both afresh.
+        """
+        self.create_control_tables()
+        cursor = self.conn.cursor()
+        completed = set()
+        if self.resume:
+            cursor.execute(f"SELECT table_name FROM {JOURNAL_TABLE}")
+            completed = {row[0] for row in cursor.fetchall()}
+        else:
+            cursor.execute(f"DELETE FROM {JOURNAL_TABLE}")
+            cursor.execute(f"DELETE FROM {CHUNK_JOURNAL_TABLE}")
+            for table in TABLES:
+                cursor.execute(f"DROP TABLE IF EXISTS {table}__chunks")
+        self.conn.commit()
+        cursor.close()
+        self.journaling = True
+        return completed
+    
     def upload_all_tables(self):
-        """Upload all tables in dependency order"""
+        """Upload the tables whose files changed, in dependency order, resuming an interrupted run if asked"""
+        completed = self.open_journal()
+        if completed:
+            print(f"Resuming: already loaded by the interrupted run: {', '.join(t for t in TABLES if t in completed)}")
+        tables = [table for table in self.tables_to_load() if table not in completed]
+        if not tables:
+            print("All tables unchanged since their last load; nothing to upload")
+            return 0, []
+        if self.bulk_load:
+            result = self.bulk_upload_all_tables(tables)
+            self.write_metrics_report()
+            return result
+        result = self.load_all_tables(tables=tables)
+        if self.delta_load:
+            totals = [sum(counts[i] for counts in self.delta_counts.values()) for i in range(3)]
+            print(f"Delta totals: {totals[0]:,} inserted, {totals[1]:,} updated, {totals[2]:,} unchanged")
+        if self.shadow_load:
+            # Referencing tables were reloaded after their parents, so their re-attached keys now hold
+            self.conn.commit()
+            print("Validating foreign keys re-attached by the swaps...")
+            self.validate_foreign_keys()
+        self.write_metrics_report()
+        return result
+    
+    def load_all_tables(self, dependencies=None, tables=TABLES):
+        """Load the tables, concurrently when workers > 1 (dependencies default to the FK graph)"""
+        if self.workers > 1:
+            return self.upload_all_tables_parallel(dependencies, tables)
+        
         success_count = 0
         failed_tables = []
-        total_rows = 0
         
-        print(f"Starting upload of {len(TABLES)} tables...")
+        print(f"Starting upload of {len(tables)} tables...")
         print("=" * 60)
         
-        for i, table in enumerate(TABLES, 1):
-            print(f"[{i}/{len(TABLES)}] Processing table: {table}")
+        for i, table in enumerate(tables, 1):
+            print(f"[{i}/{len(tables)}] Processing table: {table}")
             
             if self.upload_table(table):
                 success_count += 1
-                # Get row count for summary
-                try:
-                    cursor = self.conn.cursor()
-                    cursor.execute(f"SELECT COUNT(*) FROM {table}")
-                    table_rows = cursor.fetchone()[0]
-                    cursor.close()
-                    total_rows += table_rows
-                except:
-                    pass
             else:
                 failed_tables.append(table)
             
@@ -194,50 +1416,101 @@ class WakefitDataUploader:
         print("Upload Summary:")
         print(f"  Successful: {success_count} tables")
         print(f"  Failed: {len(failed_tables)} tables")
-        print(f"  Total rows uploaded: {total_rows:,}")
+        print(f"  Total rows uploaded: {self.metrics.loaded_rows():,}")
         
         if failed_tables:
             print(f"  Failed tables: {', '.join(failed_tables)}")
         
         return success_count, failed_tables
     
+    def row_estimates(self):
+        """Row estimates of every table without scanning: pg_class.reltuples, or else the
+        row count of the file recorded at its last load. reltuples is -1 until a table is
+        first analyzed, so it is clamped at 0 when no load is recorded (None when the
+        table does not exist)"""
+        cursor = self.conn.cursor()
+        cursor.execute(f"""
+            SELECT t.table_name,
+                   CASE WHEN c.reltuples >= 0 OR m.row_count IS NULL THEN GREATEST(c.reltuples, 0)::bigint
+                        ELSE m.row_count END
+            FROM unnest(%s::text[]) AS t(table_name)
+            JOIN pg_class c ON c.oid = to_regclass(t.table_name)
+            LEFT JOIN {MANIFEST_TABLE} m ON m.table_name = t.table_name AND m.table_oid = c.oid
+        """, (TABLES,))
+        estimates = dict(cursor.fetchall())
+        self.conn.commit()
+        cursor.close()
+        return {table: estimates.get(table) for table in TABLES}
+    
+    def write_metrics_report(self):
+        """Write upload_metrics.json next to the data files"""
+        path = self.csv_folder / 'upload_metrics.json'
+        self.metrics.write_report(path, self.row_estimates())
+        print(f"Load metrics: {path}")
+    
     def show_table_counts(self):
-        """Display final row counts for all tables"""
+        """Display final row counts: exact for tables replaced or verified in this run, estimated (~) otherwise"""
         print("\nFinal table counts:")
         print("-" * 40)
         
-        cursor = self.conn.cursor()
+        estimates = self.row_estimates()
         for table in TABLES:
-            try:
-                cursor.execute(f"SELECT COUNT(*) FROM {table}")
-                count = cursor.fetchone()[0]
-                print(f"  {table:<25} {count:>10,} rows")
-            except Exception as e:
-                print(f"  {table:<25} {'Error':>10}")
-        cursor.close()
+            exact = self.metrics.tables.get(table, {}).get('table_rows')
+            if exact is not None:
+                print(f"  {table:<25} {exact:>10,} rows")
+            elif estimates.get(table) is not None:
+                print(f"  {table:<25} {'~' + format(estimates[table], ','):>10} rows")
+            else:
+                print(f"  {table:<25} {'unknown':>10}")
 
-def main():
-    print("Wakefit Supply Chain Data Upload Script")
+def parse_arguments(description="Upload the Wakefit supply chain dataset to PostgreSQL"):
+    """Command line options shared by the upload engines (everything else comes from .env / DB_* settings)"""
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument('--resume', action='store_true',
+                        help="continue an interrupted upload from its load journal instead of starting over")
+    parser.add_argument('--verify', action='store_true', default=VERIFY_COUNTS,
+                        help="check every loaded table with a full-scan COUNT(*) (default from VERIFY_COUNTS)")
+    return parser.parse_args()
+
+def check_settings(title, args):
+    """Print the upload settings and check the password and data folder; returns whether to go ahead"""
+    print(title)
     print("=" * 60)
     print(f"Database: {POSTGRES_CONFIG['database']}")
     print(f"Host: {POSTGRES_CONFIG['host']}")
     print(f"User: {POSTGRES_CONFIG['user']}")
     print(f"CSV Folder: {CSV_FOLDER}")
+    print(f"Data Format: {DATA_FORMAT}")
+    print(f"Load Method: {LOAD_METHOD}")
+    print(f"Upload Workers: {UPLOAD_WORKERS}")
+    print(f"Max Connections: {UPLOAD_MAX_CONNECTIONS}")
+    print(f"Bulk Load: {'yes' if BULK_LOAD else 'no'}")
+    print(f"Shadow Load: {'yes' if SHADOW_LOAD else 'no'}")
+    print(f"Delta Load: {'yes' if DELTA_LOAD else 'no'}")
+    print(f"Force Reload: {'yes' if FORCE_RELOAD else 'no'}")
+    print(f"Resume: {'yes' if args.resume else 'no'}")
+    print(f"Verify Counts: {'yes' if args.verify else 'no'}")
     print("=" * 60)
     
     # Check if password is set
     if not POSTGRES_CONFIG['password']:
         print("Error: Database password not set.")
         print("Please set DB_PASSWORD in your .env file or environment variable")
-        return 1
+        return False
     
     # Validate CSV folder
     if not os.path.exists(CSV_FOLDER):
         print(f"Error: CSV folder does not exist: {CSV_FOLDER}")
+        return False
+    return True
+
+def main():
+    args = parse_arguments()
+    if not check_settings("Wakefit Supply Chain Data Upload Script", args):
         return 1
     
     # Create uploader
-    uploader = WakefitDataUploader(CSV_FOLDER, POSTGRES_CONFIG)
+    uploader = WakefitDataUploader(CSV_FOLDER, POSTGRES_CONFIG, resume=args.resume, verify=args.verify)
     
     # Connect to database
     if not uploader.connect_db():
@@ -0,0 +1,341 @@
+#!/usr/bin/env python3
+"""
+Wakefit Generate-and-Load Pipeline
+Streams generated tables straight into PostgreSQL over COPY, with no
+intermediate CSV files (optionally teed to files for auditing)
+"""
+
+import argparse
+import os
+import queue
+import sys
+import threading
+from datetime import datetime
+
+import numpy as np
+import psycopg2
+
+from create_wakefit_database import table_dependencies
+from optimized_wakefit_generator import (FORECAST_GRANULARITIES, OUTPUT_FORMATS, ColumnarTable, CsvTableSink, TableSink,
+                                         WakefitFinalDataGenerator)
+from upload_wakefit_data import MANIFEST_TABLE, POSTGRES_CONFIG, TABLES, CopyStream, load_tiers
+
+# Encoded chunks buffered per table between generation and its COPY stream; a full queue blocks
+# generation until the database catches up, which bounds memory at about this many chunks per table
+PIPELINE_QUEUE_CHUNKS = int(os.environ.get('PIPELINE_QUEUE_CHUNKS', 4))
+PIPELINE_CHUNK_ROWS = int(os.environ.get('PIPELINE_CHUNK_ROWS', 50_000))
+# Longest discard() waits for a staging table lock before giving up on dropping it
+PIPELINE_DISCARD_LOCK_TIMEOUT = os.environ.get('PIPELINE_DISCARD_LOCK_TIMEOUT', '30s')
+
+# Queued in place of a chunk to make a COPY stream fail, so its transaction rolls back
+ABORT_COPY = object()
+
+
+class CopyAborted(Exception):
+    """Raised inside a COPY stream to abandon it"""
+
+
+def drain_chunks(chunks: queue.Queue):
+    """Yield queued chunks until the None sentinel, raising CopyAborted on the abort sentinel"""
+    while True:
+        chunk = chunks.get()
+        if chunk is None:
+            return
+        if chunk is ABORT_COPY:
+            raise CopyAborted("pipeline aborted")
+        yield chunk
+
+
+class CopyTableSink(TableSink):
+    """Streams table chunks into PostgreSQL staging tables instead of files.
+
+    Each table gets an UNLOGGED staging copy, a bounded queue of CSV-encoded
+    chunks and a thread running one COPY FROM STDIN that drains it, so
+    encoding in the generator overlaps with network I/O and a slow database
+    applies back-pressure rather than buffering without limit. Nothing is
+    visible until publish(), which moves every staging table into place in
+    foreign-key order in one transaction. With ``tee`` (a file sink) every
+    chunk is also written to its file.
+    """
+
+    extension = 'csv'
+
+    def __init__(self, output_dir: str, db_config: dict, chunk_rows: int = PIPELINE_CHUNK_ROWS,
+                 queue_chunks: int = PIPELINE_QUEUE_CHUNKS, tee: TableSink = None):
+        super().__init__(output_dir, chunk_rows)
+        self.db_config = db_config
+        self.queue_chunks = queue_chunks
+        self.tee = tee
+        self.bytes = {}
+        self._failures = []
+
+    @staticmethod
+    def staging(name: str) -> str:
+        return f"{name}__pipeline"
+
+    def path(self, name: str) -> str:
+        return self.tee.path(name) if self.tee else self.staging(name)
+
+    def file_size(self, name: str) -> int:
+        """Bytes written to a table's tee file, or streamed to COPY without a tee"""
+        return self.tee.file_size(name) if self.tee else self.bytes.get(name, 0)
+
+    def file_digest(self, name: str, block_bytes: int = 1024 * 1024) -> str:
+        if self.tee is None:
+            raise ValueError("File digests need a tee; streamed tables have no file")
+        return self.tee.file_digest(name, block_bytes)
+
+    def _open(self, table: ColumnarTable):
+        staging = self.staging(table.name)
+        conn = psycopg2.connect(**self.db_config)
+        with conn.cursor() as cursor:
+            cursor.execute(f"DROP TABLE IF EXISTS {staging}")
+            cursor.execute(f"CREATE UNLOGGED TABLE {staging} (LIKE {table.name} INCLUDING DEFAULTS)")
+        conn.commit()
+
+        chunks = queue.Queue(maxsize=self.queue_chunks)
+        thread = threading.Thread(target=self._copy, args=(conn, table.name, table.columns, chunks),
+                                  name=f"copy-{table.name}", daemon=True)
+        thread.start()
+        self.bytes[table.name] = 0
+
+        tee_writer = None
+        if self.tee:
+            tee_writer = self.tee._writers[table.name] = self.tee._open(table)
+        return chunks, thread, tee_writer
+
+    def _copy(self, conn, name: str, columns, chunks: queue.Queue):
+        """COPY one table's chunks into its staging table until the None sentinel arrives.
+
+        An ABORT_COPY sentinel makes the stream raise, which fails the COPY;
+        closing the connection uncommitted then rolls it back and releases
+        the staging table.
+        """
+        try:
+            with conn.cursor() as cursor:
+                cursor.copy_expert(f"COPY {self.staging(name)} ({','.join(columns)}) FROM STDIN WITH (FORMAT csv)",
+                                   CopyStream(drain_chunks(chunks)), size=1024 * 1024)
+            conn.commit()
+        except CopyAborted:
+            pass
+        except Exception as e:
+            self._failures.append((name, e))
+        finally:
+            conn.close()
+
+    def _write_chunk(self, writer, table: ColumnarTable, start: int, stop: int):
+        chunks, thread, tee_writer = writer
+        if tee_writer is not None:
+            self.tee._write_chunk(tee_writer, table, start, stop)
+        text = CsvTableSink.encode(table, start, stop)
+        self.bytes[table.name] += len(text)
+        self._put(chunks, text)
+
+    def _put(self, chunks: queue.Queue, item):
+        """Queue a chunk, blocking while the queue is full but failing fast once any COPY has failed"""
+        while True:
+            self._raise_failures()
+            try:
+                chunks.put(item, timeout=0.5)
+                return
+            except queue.Full:
+                continue
+
+    def _raise_failures(self):
+        if self._failures:
+            name, error = self._failures[0]
+            raise RuntimeError(f"COPY into {self.staging(name)} failed: {error}".rstrip()) from error
+
+    def close(self):
+        """End every COPY stream and wait for it to commit"""
+        for chunks, thread, _ in self._writers.values():
+            if thread.is_alive():
+                self._put(chunks, None)
+        for _, thread, _ in self._writers.values():
+            thread.join()
+        if self.tee:
+            self.tee.close()
+        self._raise_failures()
+
+    def read_column(self, name: str, column: str, chunk_rows: int = 1_000_000):
+        """Read one column back from the tee file, or else from the staging table"""
+        if self.tee:
+            yield from self.tee.read_column(name, column, chunk_rows)
+            return
+        conn = psycopg2.connect(**self.db_config)
+        try:
+            with conn.cursor(name=f"read_{name}_{column}") as cursor:
+                cursor.itersize = chunk_rows
+                cursor.execute(f"SELECT {column}::text FROM {self.staging(name)}")
+                while True:
+                    rows = cursor.fetchmany(chunk_rows)
+                    if not rows:
+                        break
+                    yield np.array([row[0] for row in rows], dtype=object)
+        finally:
+            conn.close()
+
+    def publish(self) -> dict:
+        """Replace every streamed table by its staging copy in one transaction; returns rows per table.
+
+        Targets are truncated together, then filled parents first, so foreign
+        keys are checked as usual. Upload manifest entries of the replaced
+        tables are dropped, since the tables no longer hold what those
+        entries describe.
+        """
+        dependencies = table_dependencies()
+        tables = [table for tier in load_tiers(dependencies, [t for t in TABLES if t in self.rows]) for table in tier]
+        conn = psycopg2.connect(**self.db_config)
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute(f"TRUNCATE TABLE {', '.join(tables)} CASCADE")
+                for table in tables:
+                    column_list = ','.join(self.columns[table])
+                    cursor.execute(f"INSERT INTO {table} ({column_list}) SELECT {column_list} FROM {self.staging(table)}")
+                    cursor.execute(f"DROP TABLE {self.staging(table)}")
+                cursor.execute("SELECT to_regclass(%s) IS NOT NULL", (MANIFEST_TABLE,))
+                if cursor.fetchone()[0]:
+                    cursor.execute(f"DELETE FROM {MANIFEST_TABLE} WHERE table_name = ANY(%s)", (tables,))
+            conn.commit()
+        finally:
+            conn.close()
+        return {table: self.rows[table] for table in tables}
+
+    def abort(self):
+        """Fail every COPY stream still running and wait for it to roll back"""
+        for chunks, thread, _ in self._writers.values():
+            while thread.is_alive():
+                try:
+                    chunks.put(ABORT_COPY, timeout=0.5)
+                    break
+                except queue.Full:
+                    continue
+        for _, thread, _ in self._writers.values():
+            thread.join()
+
+    def discard(self):
+        """Abort any live COPY streams, then drop the staging tables of the abandoned run"""
+        self.abort()
+        conn = psycopg2.connect(**self.db_config)
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute("SET lock_timeout = %s", (PIPELINE_DISCARD_LOCK_TIMEOUT,))
+                for name in self._writers:
+                    cursor.execute(f"DROP TABLE IF EXISTS {self.staging(name)}")
+            conn.commit()
+        finally:
+            conn.close()
+
+
+class WakefitPipelineGenerator(WakefitFinalDataGenerator):
+    """Generator whose tables stream into PostgreSQL through a CopyTableSink.
+
+    Reports still go to ``output_dir``; data files are only written there
+    when ``tee`` is set, in the generator's ``output_format``.
+    """
+
+    def __init__(self, db_config, tee=False, queue_chunks=PIPELINE_QUEUE_CHUNKS, **kwargs):
+        super().__init__(**kwargs)
+        self.db_config = db_config
+        self.tee = tee
+        self.queue_chunks = queue_chunks
+
+    def __getstate__(self):
+        state = super().__getstate__()
+        state['db_config'] = None  # shard workers never connect
+        return state
+
+    def create_sink(self) -> TableSink:
+        return CopyTableSink(self.output_dir, self.db_config,
+                             chunk_rows=min(PIPELINE_CHUNK_ROWS, self.write_block_rows), queue_chunks=self.queue_chunks,
+                             tee=super().create_sink() if self.tee else None)
+
+    def write_manifest(self):
+        """Manifest of the tee files; streamed tables have no files to describe"""
+        if self.tee:
+            return super().write_manifest()
+        return None
+
+
+def run_pipeline(generator: WakefitPipelineGenerator) -> dict:
+    """Generate everything into staging tables, then publish them; staging is dropped on failure"""
+    try:
+        generator.generate_all_data()
+        print("\nPublishing streamed tables...")
+        return generator.sink.publish()
+    except BaseException:
+        if generator.sink is not None:
+            generator.sink.discard()
+        raise
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate the Wakefit dataset straight into PostgreSQL")
+    parser.add_argument('--output-dir', default='wakefit_final_data', help="directory for reports and tee files")
+    parser.add_argument('--start-date', default='2024-01-01', help="first order date (YYYY-MM-DD)")
+    parser.add_argument('--end-date', default='2024-03-31', help="last order date (YYYY-MM-DD)")
+    parser.add_argument('--daily-orders', type=int, default=100, help="target orders per day")
+    parser.add_argument('--seed', type=int, default=42, help="random seed for the vectorized engines")
+    parser.add_argument('--memory-limit-mb', type=float, default=None,
+                        help="memory ceiling; caps the worker count and the rows written per block, "
+                             "without changing the output")
+    parser.add_argument('--shard-days', type=int, default=7, help="days of orders per generation shard")
+    parser.add_argument('--workers', type=int, default=1, help="worker processes generating shards (0 = all cores)")
+    parser.add_argument('--faker-cache-dir', default=None,
+                        help="directory caching the pre-sampled Faker value pools by locale and seed")
+    parser.add_argument('--forecast-granularity', choices=FORECAST_GRANULARITIES, default='month',
+                        help="period of the demand forecasts")
+    parser.add_argument('--forecast-horizon-days', type=int, default=30,
+                        help="days between making a forecast and the start of its period")
+    parser.add_argument('--tee', action='store_true', help="also write every table to a file in --output-dir")
+    parser.add_argument('--format', choices=OUTPUT_FORMATS, default='csv', help="tee file format")
+    parser.add_argument('--queue-chunks', type=int, default=PIPELINE_QUEUE_CHUNKS,
+                        help="encoded chunks buffered per table before generation waits for COPY")
+    args = parser.parse_args()
+
+    print("Wakefit Generate-and-Load Pipeline")
+    print("=" * 60)
+    print(f"Database: {POSTGRES_CONFIG['database']}")
+    print(f"Host: {POSTGRES_CONFIG['host']}")
+    print(f"Tee: {f'{args.output_dir} ({args.format})' if args.tee else 'no'}")
+    print(f"Queue: {args.queue_chunks} chunks per table")
+    print("=" * 60)
+
+    if not POSTGRES_CONFIG['password']:
+        print("Error: Database password not set (DB_PASSWORD)")
+        return 1
+
+    generator = WakefitPipelineGenerator(
+        POSTGRES_CONFIG,
+        tee=args.tee,
+        queue_chunks=args.queue_chunks,
+        output_dir=args.output_dir,
+        start_date=args.start_date,
+        end_date=args.end_date,
+        daily_orders=args.daily_orders,
+        seed=args.seed,
+        memory_limit_mb=args.memory_limit_mb,
+        output_format=args.format,
+        shard_days=args.shard_days,
+        workers=args.workers,
+        faker_cache_dir=args.faker_cache_dir,
+        forecast_granularity=args.forecast_granularity,
+        forecast_horizon_days=args.forecast_horizon_days
+    )
+
+    try:
+        published = run_pipeline(generator)
+    except Exception as e:
+        print(f"\nPipeline failed, nothing was published: {e}")
+        return 1
+
+    print("\nPublished tables:")
+    print("-" * 40)
+    for table, rows in published.items():
+        print(f"  {table:<25} {rows:>10,} rows")
+    print(f"\nPipeline completed at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())